@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
 import homeassistant.helpers.device_registry as dr
@@ -17,24 +18,35 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.importlib import async_import_module
 
 from .const import (
     CONF_CONNECTION,
     CONF_CONNECTION_RESTAPI,
     CONF_DETECT_EMPTY_MODBUS_DATA,
+    CONF_FAST_SAMPLE_INTERVAL,
+    CONF_FAST_SAMPLE_KEYS,
     CONF_SERIAL_NUMBER,
+    DEFAULT_FAST_SAMPLE_INTERVAL_S,
+    DEFAULT_FAST_SAMPLE_KEYS,
     DOMAIN,
     FERNPORTAL_URL,
     MANUFACTURER,
     VERSION,
 )
-from .coordinator import XthermaDataUpdateCoordinator
-from .xtherma_client_modbus import XthermaClientModbus
-from .xtherma_client_rest import XthermaClientRest
+from .coordinator import (
+    PublishPolicy,
+    XthermaDataUpdateCoordinator,
+    async_remove_snapshot,
+)
+from .xtherma_client_rest import XthermaClientRest, async_get_rest_quota
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
+    from .xtherma_client_common import XthermaClient
+    from .xtherma_client_modbus import XthermaClientModbus
+
 type XthermaConfigEntry = ConfigEntry[XthermaData]
 
 _LOGGER = logging.getLogger(__name__)
@@ -57,6 +69,26 @@ class XthermaData:
     device_info: dr.DeviceInfo
 
 
+async def async_create_modbus_client(
+    hass: HomeAssistant,
+    host: str,
+    port: int,
+    address: int,
+) -> XthermaClientModbus:
+    """Create a Modbus client, sharing the connection to the server.
+
+    The Modbus client and the vendored pymodbus are imported on first use,
+    installations only using the REST API never load them.
+    """
+    modbus = await async_import_module(hass, f"{__name__}.xtherma_client_modbus")
+    return modbus.XthermaClientModbus(
+        host=host,
+        port=port,
+        address=address,
+        pool=modbus.async_get_modbus_pool(hass),
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: XthermaConfigEntry,
@@ -67,20 +99,23 @@ async def async_setup_entry(
 
     # create API client connector
     connection = entry.data.get(CONF_CONNECTION, CONF_CONNECTION_RESTAPI)
+    modbus_client: XthermaClientModbus | None = None
     if connection == CONF_CONNECTION_RESTAPI:
         api_key = entry.data[CONF_API_KEY]
-        client = XthermaClientRest(
+        client: XthermaClient = XthermaClientRest(
             url=FERNPORTAL_URL,
             api_key=api_key,
             serial_number=serial_number,
             session=async_get_clientsession(hass),
+            quota=await async_get_rest_quota(hass, api_key),
         )
     else:
         serial_number = entry.data[CONF_SERIAL_NUMBER]
         host = entry.data[CONF_HOST]
         port = entry.data[CONF_PORT]
         address = entry.data[CONF_ADDRESS]
-        client = XthermaClientModbus(
+        client = modbus_client = await async_create_modbus_client(
+            hass,
             host=host,
             port=port,
             address=address,
@@ -100,13 +135,23 @@ async def async_setup_entry(
     await async_migrate_devices(hass, entry)
     await async_migrate_entities(hass, entry)
 
-    # Try updating data from the client. This can fail, and an exception
-    # will be thrown, causing HA to retry this entire setup after a while.
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except:
-        await coordinator.close()
-        raise
+    # only read registers of entities which are not disabled. Enabling or
+    # disabling entities reloads the config entry, which updates this.
+    if modbus_client is not None:
+        modbus_client.set_enabled_keys(async_get_enabled_keys(hass, entry, coordinator))
+
+    # Show the data stored by the last run right away, if there is any, and
+    # refresh in the background. Otherwise try updating data from the client.
+    # This can fail, and an exception will be thrown, causing HA to retry
+    # this entire setup after a while.
+    if not await coordinator.async_warm_start():
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except BaseException:
+            # release the client, e.g. a shared Modbus connection, then let
+            # HA retry the setup, also if the setup is cancelled
+            await coordinator.close()
+            raise
 
     # initialize platforms
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
@@ -119,9 +164,19 @@ async def async_setup_entry(
     ) -> None:
         """Handle options update."""
         del hass
-        if isinstance(client, XthermaClientModbus):
+        coordinator.publish_policy = PublishPolicy.from_options(config_entry.options)
+        if modbus_client is not None:
             detect_empty = config_entry.options.get(CONF_DETECT_EMPTY_MODBUS_DATA, True)
-            client.detect_empty_modbus_data = detect_empty
+            modbus_client.detect_empty_modbus_data = detect_empty
+            interval = config_entry.options.get(
+                CONF_FAST_SAMPLE_INTERVAL, DEFAULT_FAST_SAMPLE_INTERVAL_S
+            )
+            coordinator.async_set_fast_sampling(
+                config_entry.options.get(
+                    CONF_FAST_SAMPLE_KEYS, DEFAULT_FAST_SAMPLE_KEYS
+                ),
+                timedelta(seconds=interval) if interval else None,
+            )
 
     await update_options_listener(hass, entry)
 
@@ -135,11 +190,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: XthermaConfigEntry) ->
     _LOGGER.debug("Unload integration")
     xtherma_data: XthermaData = entry.runtime_data
     if xtherma_data and xtherma_data.coordinator:
+        # releases our use of a shared Modbus connection, the last
+        # config entry using it closes the connection
         _LOGGER.debug("Close data coordinator")
         await xtherma_data.coordinator.close()
     return await hass.config_entries.async_unload_platforms(entry, _PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: XthermaConfigEntry) -> None:
+    """Remove data stored for a config entry."""
+    await async_remove_snapshot(hass, entry.entry_id)
+
+
 async def async_migrate_entry(
     _: HomeAssistant, config_entry: XthermaConfigEntry
 ) -> bool:
@@ -158,6 +220,28 @@ async def async_migrate_entry(
     return True
 
 
+@callback
+def async_get_enabled_keys(
+    hass: HomeAssistant,
+    config_entry: XthermaConfigEntry,
+    coordinator: XthermaDataUpdateCoordinator,
+) -> set[str]:
+    """Get keys of all entities which are not disabled."""
+    registry = er.async_get(hass)
+    prefix = f"{config_entry.entry_id}-"
+    enabled = {
+        entity_entry.unique_id.removeprefix(prefix): entity_entry.disabled_by is None
+        for entity_entry in er.async_entries_for_config_entry(
+            registry, config_entry.entry_id
+        )
+    }
+    return {
+        desc.key
+        for desc in coordinator.get_entity_descriptions()
+        if enabled.get(desc.key, desc.entity_registry_enabled_default)
+    }
+
+
 async def async_migrate_devices(
     hass: HomeAssistant,
     config_entry: XthermaConfigEntry,
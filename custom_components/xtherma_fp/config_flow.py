@@ -6,6 +6,10 @@ import logging
 from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
+from homeassistant.components.sensor import (
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import (
     ConfigEntry,
     ConfigFlow,
@@ -32,24 +36,36 @@ from homeassistant.helpers.selector import (
     SelectSelectorMode,
 )
 
+from . import async_create_modbus_client
 from .const import (
     CONF_CONNECTION,
     CONF_CONNECTION_MODBUSTCP,
     CONF_CONNECTION_RESTAPI,
+    CONF_DEADBAND_SCALE,
     CONF_DETECT_EMPTY_MODBUS_DATA,
+    CONF_FAST_SAMPLE_INTERVAL,
+    CONF_FAST_SAMPLE_KEYS,
+    CONF_MAX_SILENCE,
+    CONF_MIN_PUBLISH_INTERVAL,
     CONF_SERIAL_NUMBER,
+    DEFAULT_DEADBAND_SCALE,
+    DEFAULT_FAST_SAMPLE_INTERVAL_S,
+    DEFAULT_FAST_SAMPLE_KEYS,
+    DEFAULT_MAX_SILENCE_S,
+    DEFAULT_MIN_PUBLISH_INTERVAL_S,
     DOMAIN,
     FERNPORTAL_URL,
 )
+from .entity_descriptors import MODBUS_ENTITY_DESCRIPTIONS
 from .xtherma_client_common import (
     XthermaError,
     XthermaNotConnectedError,
     XthermaRestBusyError,
 )
-from .xtherma_client_modbus import XthermaClientModbus
 from .xtherma_client_rest import (
     XthermaClientRest,
     XthermaTimeoutError,
+    async_get_rest_quota,
 )
 
 if TYPE_CHECKING:
@@ -90,11 +106,74 @@ USER_DATA = {
 
 BOOLEAN_SELECTOR = BooleanSelector(BooleanSelectorConfig())
 
+# Modbus values which can be sampled between updates
+_FAST_SAMPLE_KEY_OPTIONS = sorted(
+    desc.key
+    for reg_set in MODBUS_ENTITY_DESCRIPTIONS
+    for desc in reg_set.descriptors
+    if isinstance(desc, SensorEntityDescription)
+    and desc.state_class == SensorStateClass.MEASUREMENT
+)
+
 OPTIONS_DATA = {
     vol.Optional(
         CONF_DETECT_EMPTY_MODBUS_DATA,
         default=_DEF_DETECT_EMPTY_MODBUS_DATA,
     ): BOOLEAN_SELECTOR,
+    vol.Optional(
+        CONF_DEADBAND_SCALE,
+        default=DEFAULT_DEADBAND_SCALE,
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=0,
+            max=10,
+            step=0.1,
+            mode=NumberSelectorMode.BOX,
+        ),
+    ),
+    vol.Optional(
+        CONF_MIN_PUBLISH_INTERVAL,
+        default=DEFAULT_MIN_PUBLISH_INTERVAL_S,
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=0,
+            max=3600,
+            mode=NumberSelectorMode.BOX,
+            unit_of_measurement="s",
+        ),
+    ),
+    vol.Optional(
+        CONF_MAX_SILENCE,
+        default=DEFAULT_MAX_SILENCE_S,
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=0,
+            max=86400,
+            mode=NumberSelectorMode.BOX,
+            unit_of_measurement="s",
+        ),
+    ),
+    vol.Optional(
+        CONF_FAST_SAMPLE_INTERVAL,
+        default=DEFAULT_FAST_SAMPLE_INTERVAL_S,
+    ): NumberSelector(
+        NumberSelectorConfig(
+            min=0,
+            max=60,
+            mode=NumberSelectorMode.BOX,
+            unit_of_measurement="s",
+        ),
+    ),
+    vol.Optional(
+        CONF_FAST_SAMPLE_KEYS,
+        default=DEFAULT_FAST_SAMPLE_KEYS,
+    ): SelectSelector(
+        SelectSelectorConfig(
+            options=_FAST_SAMPLE_KEY_OPTIONS,
+            multiple=True,
+            mode=SelectSelectorMode.DROPDOWN,
+        ),
+    ),
 }
 
 
@@ -161,15 +240,19 @@ async def _validate_rest_api(
 
     try:
         session = aiohttp_client.async_get_clientsession(hass)
+        # validation requests count against the daily budget of the API key
         client = XthermaClientRest(
             url=FERNPORTAL_URL,
             api_key=api_key,
             serial_number=serial_number,
             session=session,
+            quota=await async_get_rest_quota(hass, api_key),
         )
-        await client.connect()
-        await client.async_get_data()
-        await client.disconnect()
+        try:
+            await client.connect()
+            await client.async_get_data()
+        finally:
+            await client.disconnect()
     except XthermaRestBusyError:
         _LOGGER.debug("RateLimitError")
         errors["base"] = "rate_limit"
@@ -209,14 +292,18 @@ async def _validate_modbus_tcp(
         return errors
 
     try:
-        client = XthermaClientModbus(
+        # shares the connection of a running config entry for the same server
+        client = await async_create_modbus_client(
+            hass,
             host=host,
             port=int(port),
             address=int(address),
         )
-        await client.connect()
-        await client.async_get_data()
-        await client.disconnect()
+        try:
+            await client.connect()
+            await client.async_get_data()
+        finally:
+            await client.disconnect()
     except XthermaTimeoutError:
         _LOGGER.debug("TimeoutError")
         errors["base"] = "timeout"
@@ -19,11 +19,29 @@ CONF_CONNECTION_MODBUSTCP = "modbus_tcp"
 
 # options keys
 CONF_DETECT_EMPTY_MODBUS_DATA = "detect_empty_modbus_data"
+CONF_DEADBAND_SCALE = "deadband_scale"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_MAX_SILENCE = "max_silence"
+
+# sensors publish changes beyond their deadbands at most once per minimum
+# interval, and at least once per max silence in seconds (0 = never)
+DEFAULT_DEADBAND_SCALE = 1.0
+DEFAULT_MIN_PUBLISH_INTERVAL_S = 0
+DEFAULT_MAX_SILENCE_S = 600
+
+# Modbus only: keys sampled between updates, every interval in seconds
+# (0 = never), and published aggregated with the next update
+CONF_FAST_SAMPLE_KEYS = "fast_sample_keys"
+CONF_FAST_SAMPLE_INTERVAL = "fast_sample_interval"
+DEFAULT_FAST_SAMPLE_KEYS = ["in_hp", "out_hp", "vf"]
+DEFAULT_FAST_SAMPLE_INTERVAL_S = 0
 
 FERNPORTAL_URL = "https://fernportal.xtherma.de/api/device"
 
-# Fernportal is rate limited to 1500 requests per day, one per minute
+# Fernportal is rate limited to 1500 requests per day, we poll at most once
+# per minute
 FERNPORTAL_RATE_LIMIT_S = 61
+FERNPORTAL_DAILY_LIMIT = 1500
 
 # timeout in seconds before we stop trying to get a response
 FERNPORTAL_TIMEOUT_S = 10
@@ -51,3 +69,11 @@ KEY_ENTRY_INPUT_FACTOR = "input_factor"
 
 # additional entity state attributes
 EXTRA_STATE_ATTRIBUTE_PARAMETER = "parameter"
+# time of the data shown until the first update after a restart
+EXTRA_STATE_ATTRIBUTE_RESTORED_FROM = "restored_from"
+# aggregates of fast sampled values since the last update
+EXTRA_STATE_ATTRIBUTE_SAMPLES = "samples"
+EXTRA_STATE_ATTRIBUTE_MIN = "min"
+EXTRA_STATE_ATTRIBUTE_MEAN = "mean"
+EXTRA_STATE_ATTRIBUTE_MAX = "max"
+EXTRA_STATE_ATTRIBUTE_ENERGY = "energy_wh"
@@ -1,23 +1,43 @@
 """DataUpdater for Xtherma Fernportal cloud integration."""
 
+import asyncio
 import logging
-from dataclasses import dataclass
+import math
+import random
+from collections.abc import Coroutine, Iterable, Mapping
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    CONF_DEADBAND_SCALE,
+    CONF_MAX_SILENCE,
+    CONF_MIN_PUBLISH_INTERVAL,
+    DEFAULT_DEADBAND_SCALE,
+    DEFAULT_MAX_SILENCE_S,
+    DEFAULT_MIN_PUBLISH_INTERVAL_S,
     DOMAIN,
-    KEY_ENTRY_INPUT_FACTOR,
-    KEY_ENTRY_KEY,
-    KEY_ENTRY_VALUE,
 )
-from .entity_descriptors import XtSensorEntityDescription
+from .entity_descriptors import XtNumericEntityDescription, XtSensorEntityDescription
+from .poll_stats import (
+    COUNTER_BUSY,
+    COUNTER_EMPTY_DATA,
+    COUNTER_TIMEOUT,
+    STAGE_CYCLE,
+    STAGE_FANOUT,
+)
+from .sampling import FastSampler, SampleWindow
 from .xtherma_client_common import (
+    INPUT_FACTORS,
     XthermaModbusBusyError,
     XthermaModbusEmptyDataError,
     XthermaModbusError,
@@ -36,18 +56,6 @@ if TYPE_CHECKING:
 
 _LOGGER = logging.getLogger(__name__)
 
-_FACTORS = {
-    "*1000": 1000,
-    "*100": 100,
-    "*10": 10,
-    "1000": 1000,
-    "100": 100,
-    "10": 10,
-    "/1000": 0.001,
-    "/100": 0.01,
-    "/10": 0.1,
-}
-
 _RFACTORS = {
     "*1000": 0.001,
     "*100": 0.01,
@@ -60,16 +68,124 @@ _RFACTORS = {
     "/10": 10,
 }
 
-# Time in seconds the device needs to process a write request.
-# During this time, we block reads which would potentially restore
-# the old value.
-_WRITE_SETTLE_TIME_S = 30
+# Time in seconds the device may need to process a write request.
+# Until the device confirms the written value, but at most for this time,
+# we block reads which would potentially restore the old value.
+_WRITE_SETTLE_TIME_S = 35
+
+# Delays in seconds between reads of the written registers. They add up to
+# less than _WRITE_SETTLE_TIME_S, so the last read back finishes before the
+# block expires. Most writes are confirmed by one of the first reads.
+_WRITE_VERIFY_DELAYS_S = (0.5, 1.0, 1.5, 2.0, 5.0, 10.0, 10.0)
+
+# Writes requested within this time are sent together, so the client can
+# merge writes of adjacent registers into one request.
+_WRITE_COALESCE_TIME_S = 0.2
+
+# Entities are only notified if their value changed. Once in a while
+# all entities are notified anyway, so states stay fresh.
+_FULL_FANOUT_INTERVAL = timedelta(minutes=10)
+
+# While the device is busy or does not answer, the poll interval grows by
+# this factor per failed update, up to _POLL_MAX_INTERVAL or the minimum
+# interval of the client, whichever is longer. Each successful
+# update shrinks it again by the minimum interval of the client.
+_POLL_BACKOFF_FACTOR = 2
+_POLL_MAX_INTERVAL = timedelta(minutes=10)
+
+# Random extra delay relative to the poll interval while backing off, so
+# clients do not return all at once after an outage.
+_POLL_JITTER = 0.1
+
+# The last good data is stored, so it can be shown right away after a
+# restart. Updates within this many seconds are stored at once, pending
+# data is also stored when Home Assistant stops.
+_SNAPSHOT_STORAGE_VERSION = 1
+_SNAPSHOT_SAVE_DELAY_S = 60
 
 
 @dataclass
 class _PendingWrite:
     value: float
     blocked_until: datetime
+    # value the device reports once it applied the write
+    expected: float
+    # value before the write, if known
+    previous: float | None = None
+
+
+@dataclass
+class _QueuedWrite:
+    desc: EntityDescription
+    value: float
+    int_value: int
+    # completion of all write requests for this key
+    futures: list[asyncio.Future[None]] = field(default_factory=list)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PublishPolicy:
+    """Decides which changes of sensor values are written as new state."""
+
+    # multiplies the deadbands of the entity descriptions, 0 disables them
+    deadband_scale: float = DEFAULT_DEADBAND_SCALE
+    # minimum time between state writes of an entity
+    min_interval: timedelta = timedelta(seconds=DEFAULT_MIN_PUBLISH_INTERVAL_S)
+    # time after which the state is written anyway, None for never
+    max_silence: timedelta | None = timedelta(seconds=DEFAULT_MAX_SILENCE_S)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> "PublishPolicy":
+        """Create the policy configured in the options of a config entry."""
+        max_silence = options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE_S)
+        return cls(
+            deadband_scale=options.get(CONF_DEADBAND_SCALE, DEFAULT_DEADBAND_SCALE),
+            min_interval=timedelta(
+                seconds=options.get(
+                    CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL_S
+                )
+            ),
+            max_silence=timedelta(seconds=max_silence) if max_silence else None,
+        )
+
+    def is_significant(
+        self,
+        desc: XtNumericEntityDescription,
+        published: float,
+        value: float,
+        elapsed: timedelta,
+    ) -> bool:
+        """Test if a value is worth writing, elapsed since the last write.
+
+        See delay() for when a significant value may be written.
+        """
+        if self.max_silence is not None and elapsed >= self.max_silence:
+            return True
+        # switching on or off is always significant
+        if (value == 0) != (published == 0):
+            return True
+        threshold = self.deadband_scale * max(
+            desc.deadband or 0.0, (desc.deadband_relative or 0.0) * abs(published)
+        )
+        if not threshold:
+            return True
+        return abs(value - published) >= threshold
+
+    def delay(self, published: float, value: float, elapsed: timedelta) -> timedelta:
+        """Get the time a significant value has to wait for the minimum interval."""
+        # switching on or off is written at once
+        if (value == 0) != (published == 0):
+            return timedelta(0)
+        return max(self.min_interval - elapsed, timedelta(0))
+
+
+def _snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, _SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.snapshot.{entry_id}")
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the data stored for a config entry."""
+    await _snapshot_store(hass, entry_id).async_remove()
 
 
 class XthermaDataUpdateCoordinator(DataUpdateCoordinator[dict[str, float]]):
@@ -85,8 +201,37 @@ class XthermaDataUpdateCoordinator(DataUpdateCoordinator[dict[str, float]]):
     ) -> None:
         """Class constructor."""
         self._client = client
+        self.stats = client.stats
         update_interval = client.update_interval()
+        self._min_interval = update_interval
+        self._poll_interval = update_interval
+        self._backoff_count = 0
         self._pending_writes: dict[str, _PendingWrite] = {}
+        self._key_listeners: dict[object | None, list[CALLBACK_TYPE]] = {}
+        self._changed_keys: set[str] | None = None
+        self._last_full_fanout: datetime | None = None
+        self._write_queue: dict[str, _QueuedWrite] = {}
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        self._snapshot_store = _snapshot_store(hass, config_entry.entry_id)
+        self._snapshot_updated: datetime | None = None
+        self.publish_policy = PublishPolicy()
+        self._sampler: FastSampler | None = None
+        self._sample_descs: list[EntityDescription] = []
+        self._cancel_sampling: CALLBACK_TYPE | None = None
+        self._sampling = False
+        # aggregates of the fast sampled keys, by key, of the last update
+        self.sample_windows: dict[str, SampleWindow] = {}
+        # time of the stored data shown until the first update succeeds
+        self.restored_from: datetime | None = None
+        # the update replaces stored data, every entity writes its state
+        self.publish_all = False
+        self._write_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=_WRITE_COALESCE_TIME_S,
+            immediate=False,
+            function=self._async_flush_writes,
+        )
         super().__init__(
             hass=hass,
             logger=_LOGGER,
@@ -98,60 +243,262 @@ class XthermaDataUpdateCoordinator(DataUpdateCoordinator[dict[str, float]]):
     async def close(self) -> None:
         """Terminate usage."""
         _LOGGER.debug("Coordinator close")
+        self._write_debouncer.async_cancel()
+        self.async_set_fast_sampling([], None)
+        await self._async_flush_writes()
+        for task in self._background_tasks:
+            task.cancel()
         await self._client.disconnect()
 
+    def _async_create_background_task(
+        self, target: Coroutine[Any, Any, None], name: str
+    ) -> None:
+        """Run a task which is cancelled when the coordinator closes."""
+        task = self.hass.async_create_background_task(target, name=name)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def async_warm_start(self) -> bool:
+        """Show the data stored by the last run and refresh in the background.
+
+        Returns False if there is no stored data, the caller then needs to
+        wait for the first refresh.
+        """
+        stored = await self._snapshot_store.async_load()
+        if not stored:
+            return False
+        try:
+            updated = datetime.fromisoformat(stored["updated"])
+            values = {key: float(value) for key, value in stored["values"].items()}
+        except (AttributeError, KeyError, TypeError, ValueError):
+            _LOGGER.warning("Ignoring invalid stored data")
+            return False
+        _LOGGER.debug("Restored %d values from %s", len(values), updated)
+        self.data = values
+        self.last_update_success = True
+        self.restored_from = updated
+        self._snapshot_updated = updated
+        # recent data saves a request, the regular schedule updates it
+        refresh = self.update_interval is None or (
+            dt_util.utcnow() - updated >= self.update_interval
+        )
+        self._async_create_background_task(
+            self._async_warm_start_refresh(refresh=refresh),
+            name=f"{DOMAIN} first refresh",
+        )
+        return True
+
+    async def _async_warm_start_refresh(self, *, refresh: bool) -> None:
+        """Connect the client and get live data."""
+        try:
+            await self._async_setup()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Connecting failed, retrying with next update: %s", err)
+        if refresh:
+            await self.async_refresh()
+
+    @callback
+    def _snapshot_to_save(self) -> dict[str, Any]:
+        updated = self._snapshot_updated or dt_util.utcnow()
+        return {"updated": updated.isoformat(), "values": self.data}
+
+    async def async_refresh(self) -> None:
+        """Refresh all data.
+
+        Scheduled updates only read data which is due, explicitly
+        requested refreshes read everything.
+        """
+        self._client.request_full_update()
+        await super().async_refresh()
+
+    @callback
+    def async_add_listener(
+        self,
+        update_callback: CALLBACK_TYPE,
+        context: object | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, indexed by context (the entity key)."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        self._key_listeners.setdefault(context, []).append(update_callback)
+
+        @callback
+        def remove() -> None:
+            remove_listener()
+            listeners = self._key_listeners[context]
+            listeners.remove(update_callback)
+            if not listeners:
+                self._key_listeners.pop(context)
+
+        return remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners whose key changed with the last update.
+
+        Listeners without a context are always updated. A full update is
+        done if no diff is available, e.g. after errors or a manual update.
+        """
+        changed_keys = self._changed_keys
+        self._changed_keys = None
+        with self.stats.measure(STAGE_FANOUT):
+            if changed_keys is None:
+                self._last_full_fanout = datetime.now(UTC)
+                super().async_update_listeners()
+                self.publish_all = False
+                return
+            self._async_notify_keys(changed_keys)
+
+    @callback
+    def _async_notify_keys(self, keys: Iterable[str]) -> None:
+        """Update listeners of some keys and listeners without a context."""
+        update_callbacks = list(self._key_listeners.get(None, []))
+        count = 0
+        for key in keys:
+            update_callbacks.extend(self._key_listeners.get(key, []))
+            count += 1
+        _LOGGER.debug("Notifying listeners of %d changed keys", count)
+        for update_callback in update_callbacks:
+            update_callback()
+
+    def _diff(self, result: dict[str, float]) -> set[str] | None:
+        """Get keys which changed since the last update, None for all keys."""
+        if (
+            self.data is None
+            or not self.last_update_success
+            or self.restored_from is not None
+        ):
+            return None
+        if (
+            self._last_full_fanout is None
+            or datetime.now(UTC) - self._last_full_fanout >= _FULL_FANOUT_INTERVAL
+        ):
+            return None
+        previous = self.data
+        return {
+            key
+            for key in result.keys() | previous.keys()
+            if result.get(key) != previous.get(key)
+        }
+
+    @property
+    def poll_state(self) -> dict[str, Any]:
+        """Get the state of the adaptive poll interval, for diagnostics."""
+        return {
+            "min_interval_s": self._min_interval.total_seconds(),
+            "interval_s": self._poll_interval.total_seconds(),
+            "scheduled_interval_s": (
+                self.update_interval.total_seconds() if self.update_interval else None
+            ),
+            "backoff_count": self._backoff_count,
+        }
+
+    def _adapt_poll_interval(self, *, overloaded: bool) -> None:
+        """Back off while the device is overloaded, recover on success (AIMD)."""
+        # the minimum may change, e.g. with the remaining REST API budget
+        self._min_interval = self._client.update_interval()
+        if overloaded:
+            self._backoff_count += 1
+            self._poll_interval = max(
+                min(self._poll_interval * _POLL_BACKOFF_FACTOR, _POLL_MAX_INTERVAL),
+                self._min_interval,
+            )
+        else:
+            self._backoff_count = 0
+            self._poll_interval = max(
+                self._poll_interval - self._min_interval, self._min_interval
+            )
+        interval = self._poll_interval
+        if interval > self._min_interval:
+            interval *= 1 + random.uniform(0, _POLL_JITTER)  # noqa: S311
+            _LOGGER.debug("Backing off, next update in %s", interval)
+        self.update_interval = interval
+
+    @callback
+    def async_set_fast_sampling(
+        self, keys: list[str], interval: timedelta | None
+    ) -> None:
+        """Sample some keys between updates, None stops sampling.
+
+        Each update then publishes the time weighted mean of the samples
+        as value, see sample_windows for the other aggregates.
+        """
+        if self._cancel_sampling is not None:
+            self._cancel_sampling()
+            self._cancel_sampling = None
+        self._sampler = None
+        self.sample_windows = {}
+        descs = [desc for desc in self.get_entity_descriptions() if desc.key in keys]
+        if interval is None or not descs:
+            return
+        _LOGGER.debug("Sampling %s every %s", keys, interval)
+        self._sample_descs = descs
+        self._sampler = FastSampler([desc.key for desc in descs])
+        self._cancel_sampling = async_track_time_interval(
+            self.hass,
+            self._async_sample,
+            interval,
+            name=f"{DOMAIN} fast sampling",
+            cancel_on_shutdown=True,
+        )
+
+    async def _async_sample(self, _: datetime) -> None:
+        """Read the fast sampled keys, unless the last read is still running."""
+        sampler = self._sampler
+        if sampler is None or self._sampling:
+            return
+        self._sampling = True
+        try:
+            snapshot = await self._client.async_read_back(
+                self._sample_descs, detect_empty=True
+            )
+        except Exception as err:  # noqa: BLE001
+            # e.g. empty data, which would fake the device switching off
+            _LOGGER.debug("Sampling failed: %s", err)
+            return
+        finally:
+            self._sampling = False
+        sampler.add(dt_util.utcnow().timestamp(), snapshot.scaled())
+
     async def _async_setup(self) -> None:
         """Set up the coordinator."""
         _LOGGER.debug("Coordinator _async_setup")
         await self._client.connect()
 
-    def _apply_input_factor(self, rawvalue: str, inputfactor: str | None) -> float:
-        value = float(rawvalue)
-        if not isinstance(inputfactor, str):
-            return value
-        factor = _FACTORS.get(inputfactor, 1.0)
-        return factor * value
+    async def _async_update_data(self) -> dict[str, float]:
+        with self.stats.measure(STAGE_CYCLE):
+            return await self._async_fetch_data()
 
-    async def _async_update_data(self) -> dict[str, float]:  # noqa: C901
-        result: dict[str, float] = {}
+    async def _async_fetch_data(self) -> dict[str, float]:  # noqa: C901
+        self._changed_keys = None
         try:
             _LOGGER.debug("Coordinator requesting new data")
-            client_data = await self._client.async_get_data()
-            for entry in client_data:
-                key = entry.get(KEY_ENTRY_KEY, "").lower()
+            snapshot = await self._client.async_get_data()
+            result = snapshot.scaled()
+            for key in list(self._pending_writes):
                 pending_write = self._is_blocked(key)
-                if pending_write is not None:
+                if pending_write is not None and key in result:
                     result[key] = pending_write
                     _LOGGER.debug(
                         'Skipping update of key="%s" due to pending write',
                         key,
                     )
-                else:
-                    rawvalue = entry.get(KEY_ENTRY_VALUE, None)
-                    inputfactor = entry.get(KEY_ENTRY_INPUT_FACTOR, None)
-                    if key is None or rawvalue is None:
-                        _LOGGER.error("entry incomplete: %s", entry)
-                        continue
-                    value = self._apply_input_factor(rawvalue, inputfactor)
-                    result[key] = value
-                    _LOGGER.debug(
-                        'key="%s" raw="%s" value="%s" inputfactor="%s"',
-                        key,
-                        rawvalue,
-                        value,
-                        inputfactor,
-                    )
         except XthermaModbusBusyError as err:
+            self.stats.count(COUNTER_BUSY)
+            self._adapt_poll_interval(overloaded=True)
             raise UpdateFailed(
                 translation_domain=DOMAIN,
                 translation_key="modbus_read_busy_error",
             ) from err
         except XthermaRestBusyError as err:
+            self.stats.count(COUNTER_BUSY)
+            self._adapt_poll_interval(overloaded=True)
             raise UpdateFailed(
                 translation_domain=DOMAIN,
                 translation_key="rest_read_busy_error",
             ) from err
         except XthermaTimeoutError as err:
+            self.stats.count(COUNTER_TIMEOUT)
+            self._adapt_poll_interval(overloaded=True)
             raise UpdateFailed(
                 translation_domain=DOMAIN,
                 translation_key="timeout_error",
@@ -178,6 +525,7 @@ class XthermaDataUpdateCoordinator(DataUpdateCoordinator[dict[str, float]]):
                 },
             ) from err
         except XthermaModbusEmptyDataError as err:
+            self.stats.count(COUNTER_EMPTY_DATA)
             raise UpdateFailed(
                 translation_domain=DOMAIN,
                 translation_key="modbus_data_empty_error",
@@ -193,7 +541,22 @@ class XthermaDataUpdateCoordinator(DataUpdateCoordinator[dict[str, float]]):
         _LOGGER.debug(
             "coordinator processed %d/%d values",
             len(result),
-            len(client_data),
+            len(snapshot.values),
+        )
+        if self._sampler is not None:
+            self.sample_windows = self._sampler.publish(
+                dt_util.utcnow().timestamp(), result
+            )
+            for key, window in self.sample_windows.items():
+                result[key] = window.mean
+        # drop the restored marker of all entities, also of unchanged ones
+        self.publish_all = self.restored_from is not None
+        self._changed_keys = self._diff(result)
+        self._adapt_poll_interval(overloaded=False)
+        self.restored_from = None
+        self._snapshot_updated = dt_util.utcnow()
+        self._snapshot_store.async_delay_save(
+            self._snapshot_to_save, _SNAPSHOT_SAVE_DELAY_S
         )
         return result
 
@@ -203,13 +566,28 @@ class XthermaDataUpdateCoordinator(DataUpdateCoordinator[dict[str, float]]):
             return self._client.get_entity_descriptions()
         return []
 
-    def _block_for(self, key: str, seconds: int, value: float) -> None:
+    def _block_for(
+        self,
+        key: str,
+        seconds: int,
+        value: float,
+        expected: float | None = None,
+    ) -> _PendingWrite:
         """Block reads for a specific register for N seconds."""
         _LOGGER.debug("Block reads of key %s for %d seconds", key, seconds)
-        self._pending_writes[key] = _PendingWrite(
+        previous = self._pending_writes.get(key)
+        pending = _PendingWrite(
             blocked_until=datetime.now(UTC) + timedelta(seconds=seconds),
             value=value,
+            expected=value if expected is None else expected,
+            previous=(
+                previous.previous
+                if previous is not None
+                else (self.data or {}).get(key)
+            ),
         )
+        self._pending_writes[key] = pending
+        return pending
 
     def _is_blocked(self, key: str) -> float | None:
         """Test if device-side processing for key is in progress."""
@@ -228,22 +606,144 @@ class XthermaDataUpdateCoordinator(DataUpdateCoordinator[dict[str, float]]):
         # key is actually blocked
         return pending.value
 
+    def _is_settled(self, pending: _PendingWrite, value: float | None) -> bool:
+        """Test if the device finished processing a write."""
+        if value is None:
+            return False
+        if math.isclose(value, pending.expected):
+            return True
+        # the device still reports the old value until it applied the write
+        return pending.previous is None or not math.isclose(value, pending.previous)
+
+    @callback
+    def _release_writes(
+        self, writes: dict[str, tuple[_PendingWrite, float | None]]
+    ) -> None:
+        """Stop blocking reads of keys and show the values the device reports."""
+        released: dict[str, float | None] = {}
+        for key, (pending, value) in writes.items():
+            # a newer write of the key, or its expiry, took over the key
+            if self._pending_writes.get(key) is not pending:
+                continue
+            self._pending_writes.pop(key, None)
+            if value is None or not math.isclose(value, pending.expected):
+                _LOGGER.warning(
+                    'Write of key="%s" not confirmed, device reports %s instead of %s',
+                    key,
+                    value,
+                    pending.expected,
+                )
+            if value is not None and self.data is not None:
+                self.data[key] = value
+            released[key] = value
+        if released:
+            self._async_notify_keys(released)
+
+    async def _async_verify_writes(
+        self, writes: dict[str, tuple[EntityDescription, _PendingWrite]]
+    ) -> None:
+        """Read back written values until the device applied them."""
+        values: dict[str, float] = {}
+        for delay in _WRITE_VERIFY_DELAYS_S:
+            await asyncio.sleep(delay)
+            # a newer write of a key takes over its verification
+            writes = {
+                key: write
+                for key, write in writes.items()
+                if self._pending_writes.get(key) is write[1]
+            }
+            if not writes:
+                return
+            try:
+                snapshot = await self._client.async_read_back(
+                    [desc for desc, _ in writes.values()]
+                )
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Reading back written values failed: %s", err)
+                continue
+            values = snapshot.scaled()
+            settled = {
+                key: (pending, values.get(key))
+                for key, (_, pending) in writes.items()
+                if self._is_settled(pending, values.get(key))
+            }
+            if settled:
+                self._release_writes(settled)
+        # deadline passed, show whatever the device reported last
+        self._release_writes(
+            {key: (pending, values.get(key)) for key, (_, pending) in writes.items()}
+        )
+
     def _reverse_apply_input_factor(self, value: float, inputfactor: str | None) -> int:
         if not isinstance(inputfactor, str):
             return int(value)
         factor = _RFACTORS.get(inputfactor, 1.0)
         return int(factor * value)
 
+    async def _async_flush_writes(self) -> None:
+        """Send all queued writes and complete their requests."""
+        # writes queued while a batch is sent find the debouncer busy,
+        # send them with the next batch
+        while self._write_queue:
+            writes = list(self._write_queue.values())
+            self._write_queue = {}
+            await self._async_send_writes(writes)
+
+    async def _async_send_writes(self, writes: list[_QueuedWrite]) -> None:
+        """Send a batch of writes and complete their requests."""
+        try:
+            errors = await self._client.async_put_data_multiple(
+                [(write.desc, write.int_value) for write in writes]
+            )
+        except Exception as err:  # noqa: BLE001
+            errors = [err] * len(writes)
+        verify: dict[str, tuple[EntityDescription, _PendingWrite]] = {}
+        for write, error in zip(writes, errors, strict=True):
+            if error is None:
+                factor = (
+                    write.desc.factor
+                    if isinstance(write.desc, XtSensorEntityDescription)
+                    else None
+                )
+                pending = self._block_for(
+                    key=write.desc.key,
+                    seconds=_WRITE_SETTLE_TIME_S,
+                    value=write.value,
+                    expected=write.int_value * INPUT_FACTORS.get(factor or "", 1.0),
+                )
+                verify[write.desc.key] = (write.desc, pending)
+            for future in write.futures:
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+        if verify:
+            self._async_create_background_task(
+                self._async_verify_writes(verify), name=f"{DOMAIN} verify writes"
+            )
+
     async def async_write(self, entity: Entity, value: float) -> None:
-        """Add a write request to the queue."""
+        """Add a write request to the queue and wait until it was sent."""
         desc = entity.entity_description
+        if isinstance(desc, XtSensorEntityDescription):
+            int_value = self._reverse_apply_input_factor(value, desc.factor)
+        else:
+            int_value = int(value)
+        write = self._write_queue.get(desc.key)
+        if write is None:
+            write = _QueuedWrite(desc=desc, value=value, int_value=int_value)
+            self._write_queue[desc.key] = write
+        else:
+            # a later write of the same key replaces the earlier one
+            write.value = value
+            write.int_value = int_value
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        write.futures.append(future)
+        await self._write_debouncer.async_call()
         try:
-            if isinstance(desc, XtSensorEntityDescription):
-                int_value = self._reverse_apply_input_factor(value, desc.factor)
-            else:
-                int_value = int(value)
-            await self._client.async_put_data(desc=desc, value=int_value)
-            self._block_for(key=desc.key, seconds=_WRITE_SETTLE_TIME_S, value=value)
+            await future
         except XthermaReadOnlyError as err:
             raise HomeAssistantError(
                 translation_domain=DOMAIN,
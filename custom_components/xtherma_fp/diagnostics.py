@@ -0,0 +1,31 @@
+"""Diagnostics support for the Xtherma integration."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_API_KEY, CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from . import XthermaConfigEntry
+from .const import CONF_SERIAL_NUMBER
+
+_TO_REDACT = {CONF_API_KEY, CONF_HOST, CONF_SERIAL_NUMBER}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: XthermaConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry, mainly how polling performs."""
+    coordinator = config_entry.runtime_data.coordinator
+    return {
+        "config_entry": {
+            "data": async_redact_data(dict(config_entry.data), _TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "last_update_success": coordinator.last_update_success,
+        "restored_from": (
+            coordinator.restored_from.isoformat() if coordinator.restored_from else None
+        ),
+        "poll_state": coordinator.poll_state,
+        "poll_stats": coordinator.stats.as_dict(),
+    }
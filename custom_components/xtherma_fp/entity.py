@@ -1,6 +1,7 @@
 "Xtherma parent entity class."
 
 import logging
+from typing import Any
 
 from homeassistant.helpers.device_registry import (
     DeviceInfo,
@@ -10,7 +11,10 @@ from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
 )
 
-from .const import EXTRA_STATE_ATTRIBUTE_PARAMETER
+from .const import (
+    EXTRA_STATE_ATTRIBUTE_PARAMETER,
+    EXTRA_STATE_ATTRIBUTE_RESTORED_FROM,
+)
 from .coordinator import XthermaDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,7 +32,7 @@ class XthermaCoordinatorEntity(CoordinatorEntity[XthermaDataUpdateCoordinator]):
         description: EntityDescription,
     ) -> None:
         """Initialize the Xtherma coordinator entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.key)
         self.entity_description = description
         self.xt_description = description
         self._attr_has_entity_name = True
@@ -41,3 +45,14 @@ class XthermaCoordinatorEntity(CoordinatorEntity[XthermaDataUpdateCoordinator]):
             EXTRA_STATE_ATTRIBUTE_PARAMETER: self.xt_description.key,
         }
         self.translation_key = description.key
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return entity specific state attributes, marking restored data."""
+        restored_from = self.coordinator.restored_from
+        if restored_from is None:
+            return self._attr_extra_state_attributes
+        return {
+            **self._attr_extra_state_attributes,
+            EXTRA_STATE_ATTRIBUTE_RESTORED_FROM: restored_from.isoformat(),
+        }
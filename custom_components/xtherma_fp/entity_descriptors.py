@@ -28,15 +28,28 @@ from homeassistant.components.switch import (
 from homeassistant.const import (
     PERCENTAGE,
     REVOLUTIONS_PER_MINUTE,
+    EntityCategory,
     UnitOfEnergy,
     UnitOfFrequency,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
     UnitOfVolumeFlowRate,
 )
 from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.typing import StateType
 
+from .poll_stats import (
+    COUNTERS,
+    STAGE_CONNECT,
+    STAGE_CYCLE,
+    STAGE_DECODE,
+    STAGE_FANOUT,
+    STAGE_MODBUS_READ,
+    STAGE_REST_PARSE,
+    STAGE_REST_REQUEST,
+)
+
 
 @dataclass(kw_only=True, frozen=True)
 class XtBinaryEntityDescription:
@@ -67,6 +80,10 @@ class XtNumericEntityDescription:
 
     factor: str | None = None
     icon_provider: Callable[[StateType | date | datetime | Decimal], str] | None = None
+    # changes of sensor values smaller than the larger of these deadbands are
+    # not published, absolute in the native unit or relative to the value
+    deadband: float | None = None
+    deadband_relative: float | None = None
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -91,6 +108,14 @@ class XtVersionSensorEntityDescription(XtSensorEntityDescription):
     """A version value sensor."""
 
 
+@dataclass(kw_only=True, frozen=True)
+class XtPollStatsSensorEntityDescription(SensorEntityDescription):
+    """A timing or event counter of the poll cycles, not a device value."""
+
+    stage: str | None = None
+    counter: str | None = None
+
+
 def _electric_switch_icon(state: bool | None) -> str:
     if state:
         return "mdi:electric-switch"
@@ -526,12 +551,21 @@ _sensor_815 = XtSwitchEntityDescription(
 #
 # Telemetry
 #
+
+# Deadbands of values which fluctuate while the heat pump runs. Temperatures
+# are reported in steps of 0.1 K, a single step is not published.
+_DEADBAND_TEMPERATURE = 0.2
+_DEADBAND_PERCENTAGE = 1.0
+_DEADBAND_POWER = 20.0
+_DEADBAND_POWER_RELATIVE = 0.02
+
 _sensor_tvl = XtSensorEntityDescription(
     key="tvl",
     native_unit_of_measurement=UnitOfTemperature.CELSIUS,
     device_class=SensorDeviceClass.TEMPERATURE,
     state_class=SensorStateClass.MEASUREMENT,
     factor="/10",
+    deadband=_DEADBAND_TEMPERATURE,
     icon=_icon_heating_in,
 )
 _sensor_trl = XtSensorEntityDescription(
@@ -540,6 +574,7 @@ _sensor_trl = XtSensorEntityDescription(
     device_class=SensorDeviceClass.TEMPERATURE,
     state_class=SensorStateClass.MEASUREMENT,
     factor="/10",
+    deadband=_DEADBAND_TEMPERATURE,
     icon=_icon_heating_out,
 )
 _sensor_tw = XtSensorEntityDescription(
@@ -588,6 +623,7 @@ _sensor_ta = XtSensorEntityDescription(
     device_class=SensorDeviceClass.TEMPERATURE,
     state_class=SensorStateClass.MEASUREMENT,
     factor="/10",
+    deadband=_DEADBAND_TEMPERATURE,
     icon=_icon_temperature,
 )
 _sensor_ta1 = XtSensorEntityDescription(
@@ -647,6 +683,7 @@ _sensor_pkl = XtSensorEntityDescription(
     native_unit_of_measurement=PERCENTAGE,
     device_class=None,
     state_class=SensorStateClass.MEASUREMENT,
+    deadband=_DEADBAND_PERCENTAGE,
     icon=_icon_pump,
 )
 _sensor_pk1 = XtBinarySensorEntityDescription(
@@ -725,6 +762,8 @@ _sensor_in_hp = XtSensorEntityDescription(
     device_class=SensorDeviceClass.POWER,
     state_class=SensorStateClass.MEASUREMENT,
     factor="*10",
+    deadband=_DEADBAND_POWER,
+    deadband_relative=_DEADBAND_POWER_RELATIVE,
     icon=_icon_electric_power,
 )
 _sensor_v = XtSensorEntityDescription(
@@ -741,6 +780,8 @@ _sensor_out_hp = XtSensorEntityDescription(
     device_class=SensorDeviceClass.POWER,
     state_class=SensorStateClass.MEASUREMENT,
     factor="*10",
+    deadband=_DEADBAND_POWER,
+    deadband_relative=_DEADBAND_POWER_RELATIVE,
     icon=_icon_thermal_power,
 )
 _sensor_efficiency_hp = XtSensorEntityDescription(
@@ -761,6 +802,8 @@ _sensor_in_backup = XtSensorEntityDescription(
     device_class=SensorDeviceClass.POWER,
     state_class=SensorStateClass.MEASUREMENT,
     factor="*10",
+    deadband=_DEADBAND_POWER,
+    deadband_relative=_DEADBAND_POWER_RELATIVE,
     icon=_icon_electric_power,
 )
 _sensor_out_backup = XtSensorEntityDescription(
@@ -769,6 +812,8 @@ _sensor_out_backup = XtSensorEntityDescription(
     device_class=SensorDeviceClass.POWER,
     state_class=SensorStateClass.MEASUREMENT,
     factor="*10",
+    deadband=_DEADBAND_POWER,
+    deadband_relative=_DEADBAND_POWER_RELATIVE,
     icon=_icon_thermal_power,
 )
 _sensor_in_total = XtSensorEntityDescription(
@@ -777,6 +822,8 @@ _sensor_in_total = XtSensorEntityDescription(
     device_class=SensorDeviceClass.POWER,
     state_class=SensorStateClass.MEASUREMENT,
     factor="*10",
+    deadband=_DEADBAND_POWER,
+    deadband_relative=_DEADBAND_POWER_RELATIVE,
     icon=_icon_electric_power,
 )
 _sensor_out_total = XtSensorEntityDescription(
@@ -785,6 +832,8 @@ _sensor_out_total = XtSensorEntityDescription(
     device_class=SensorDeviceClass.POWER,
     state_class=SensorStateClass.MEASUREMENT,
     factor="*10",
+    deadband=_DEADBAND_POWER,
+    deadband_relative=_DEADBAND_POWER_RELATIVE,
     icon=_icon_thermal_power,
 )
 _sensor_ta8 = XtSensorEntityDescription(
@@ -938,11 +987,22 @@ _sensor_evu = XtBinarySensorEntityDescription(
 )
 
 
+# Poll intervals in seconds for register sets.
+# Settings only change when written, telemetry changes all the time.
+MODBUS_POLL_INTERVAL_FAST = 15
+MODBUS_POLL_INTERVAL_NORMAL = 30
+MODBUS_POLL_INTERVAL_SLOW = 300
+
+
 @dataclass(kw_only=True, frozen=True)
 class ModbusRegisterSet:
     """Register set."""
 
     base: int
+    # seconds between reads of this set
+    poll_interval: int
+    # sets with lower values are requested first
+    priority: int
     descriptors: list[
         XtSensorEntityDescription
         | XtBinarySensorEntityDescription
@@ -955,6 +1015,8 @@ class ModbusRegisterSet:
 
 _MODBUS_SETTINGS_GENERAL = ModbusRegisterSet(
     base=0,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=5,
     descriptors=[
         _sensor_001,
         _sensor_002,
@@ -964,6 +1026,8 @@ _MODBUS_SETTINGS_GENERAL = ModbusRegisterSet(
 
 _MODBUS_SETTINGS_HEATING_CURVE_1 = ModbusRegisterSet(
     base=10,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=5,
     descriptors=[
         _sensor_310,
         _sensor_311,
@@ -976,6 +1040,8 @@ _MODBUS_SETTINGS_HEATING_CURVE_1 = ModbusRegisterSet(
 
 _MODBUS_SETTINGS_COOLING_CURVE_1 = ModbusRegisterSet(
     base=20,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=5,
     descriptors=[
         _sensor_350,
         _sensor_351,
@@ -988,6 +1054,8 @@ _MODBUS_SETTINGS_COOLING_CURVE_1 = ModbusRegisterSet(
 
 _MODBUS_SETTINGS_HEATING_CURVE_2 = ModbusRegisterSet(
     base=30,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=5,
     descriptors=[
         _sensor_410,
         _sensor_411,
@@ -1000,6 +1068,8 @@ _MODBUS_SETTINGS_HEATING_CURVE_2 = ModbusRegisterSet(
 
 _MODBUS_SETTINGS_COOLING_CURVE_2 = ModbusRegisterSet(
     base=40,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=5,
     descriptors=[
         _sensor_450,
         _sensor_451,
@@ -1012,6 +1082,8 @@ _MODBUS_SETTINGS_COOLING_CURVE_2 = ModbusRegisterSet(
 
 _MODBUS_SETTINGS_HOT_WATER = ModbusRegisterSet(
     base=50,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=5,
     descriptors=[
         _sensor_501,
         _sensor_522,
@@ -1020,6 +1092,8 @@ _MODBUS_SETTINGS_HOT_WATER = ModbusRegisterSet(
 
 _MODBUS_SETTINGS_NETWORK = ModbusRegisterSet(
     base=60,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=5,
     descriptors=[
         _sensor_808,
         _sensor_811,
@@ -1031,6 +1105,8 @@ _MODBUS_SETTINGS_NETWORK = ModbusRegisterSet(
 
 _MODBUS_TELEMETRY_GENERAL = ModbusRegisterSet(
     base=100,
+    poll_interval=MODBUS_POLL_INTERVAL_NORMAL,
+    priority=2,
     descriptors=[
         _sensor_controller_v,
         _sensor_mode,
@@ -1043,6 +1119,8 @@ _MODBUS_TELEMETRY_GENERAL = ModbusRegisterSet(
 
 _MODBUS_TELEMETRY_TARGET_VALUES = ModbusRegisterSet(
     base=110,
+    poll_interval=MODBUS_POLL_INTERVAL_NORMAL,
+    priority=3,
     descriptors=[
         _sensor_h_target,
         _sensor_h1_target,
@@ -1056,6 +1134,8 @@ _MODBUS_TELEMETRY_TARGET_VALUES = ModbusRegisterSet(
 
 _MODBUS_TELEMETRY_TEMPERATURE_SENSORS = ModbusRegisterSet(
     base=120,
+    poll_interval=MODBUS_POLL_INTERVAL_FAST,
+    priority=1,
     descriptors=[
         _sensor_tk,
         _sensor_tk1,
@@ -1069,6 +1149,8 @@ _MODBUS_TELEMETRY_TEMPERATURE_SENSORS = ModbusRegisterSet(
 
 _MODBUS_TELEMETRY_PUMPS_AND_ACTORS = ModbusRegisterSet(
     base=130,
+    poll_interval=MODBUS_POLL_INTERVAL_FAST,
+    priority=1,
     descriptors=[
         _sensor_v,
         _sensor_pk,
@@ -1084,6 +1166,8 @@ _MODBUS_TELEMETRY_PUMPS_AND_ACTORS = ModbusRegisterSet(
 
 _MODBUS_TELEMETRY_OUTSIDE_TEMPERATURES = ModbusRegisterSet(
     base=140,
+    poll_interval=MODBUS_POLL_INTERVAL_NORMAL,
+    priority=3,
     descriptors=[
         _sensor_ta,
         _sensor_ta1,
@@ -1095,6 +1179,8 @@ _MODBUS_TELEMETRY_OUTSIDE_TEMPERATURES = ModbusRegisterSet(
 
 _MODBUS_TELEMETRY_PERFORMANCE_LIVE = ModbusRegisterSet(
     base=170,
+    poll_interval=MODBUS_POLL_INTERVAL_FAST,
+    priority=0,
     descriptors=[
         _sensor_out_hp,
         _sensor_in_hp,
@@ -1109,6 +1195,8 @@ _MODBUS_TELEMETRY_PERFORMANCE_LIVE = ModbusRegisterSet(
 
 _MODBUS_TELEMETRY_PER_DAY_ENERGY = ModbusRegisterSet(
     base=180,
+    poll_interval=MODBUS_POLL_INTERVAL_SLOW,
+    priority=4,
     descriptors=[
         _sensor_day_hp_out_h,
         _sensor_day_hp_in_h,
@@ -1146,8 +1234,20 @@ MODBUS_ENTITY_DESCRIPTIONS: list[ModbusRegisterSet] = [
 
 
 # The modbus protocol only allows reading up to 125 registers at once.
-# Therefore, we need to split the entire register range into
-# manageable sub ranges.
+MODBUS_MAX_READ_COUNT = 125
+
+# Cost model for planning read requests, in bytes on the wire. A read request
+# and its response header cost 21 bytes, but the round trip to slow gateways
+# dominates, so a request is weighted like 100 bytes. Reading an unused
+# register to close a gap between two used ones costs its 2 payload bytes.
+_MODBUS_REQUEST_COST = 100
+_MODBUS_GAP_REGISTER_COST = 2
+
+# Registers which cannot ever be zero on a working device. One of them is used
+# as sentinel of each planned range, see ModbusRegisterRange.non_empty_reg.
+_MODBUS_NON_EMPTY_KEYS = ("501", "controller_v")
+
+
 @dataclass(kw_only=True, frozen=True)
 class ModbusRegisterRange:
     """Definition of a register range which is read in one call."""
@@ -1159,7 +1259,8 @@ class ModbusRegisterRange:
     # a register in this range which cannot ever be empty
     # this is used to detect bogus reads where the device sends us
     # empty data instead of, for instance, a busy response.
-    non_empty_reg: int
+    # None if the range contains no such register.
+    non_empty_reg: int | None
 
     @property
     def length(self) -> int:
@@ -1167,13 +1268,91 @@ class ModbusRegisterRange:
         return self.last_reg - self.first_reg + 1
 
 
-MODBUS_REGISTER_RANGES: list[ModbusRegisterRange] = [
-    ModbusRegisterRange(first_reg=0, last_reg=71, non_empty_reg=50),
-    ModbusRegisterRange(first_reg=100, last_reg=193, non_empty_reg=100),
-]
+def _used_registers(
+    reg_sets: list[ModbusRegisterSet],
+    enabled_keys: set[str] | None,
+) -> tuple[list[int], set[int]]:
+    """Return sorted used registers and those among them which are never empty."""
+    regs: list[int] = []
+    non_empty_regs: set[int] = set()
+    for reg_set in reg_sets:
+        for i, desc in enumerate(reg_set.descriptors):
+            if desc is None:
+                continue
+            # sentinels are read whether their entities are enabled or not
+            if desc.key in _MODBUS_NON_EMPTY_KEYS:
+                non_empty_regs.add(reg_set.base + i)
+            elif enabled_keys is not None and desc.key not in enabled_keys:
+                continue
+            regs.append(reg_set.base + i)
+    regs.sort()
+    return regs, non_empty_regs
+
+
+def plan_register_ranges(
+    reg_sets: list[ModbusRegisterSet],
+    enabled_keys: set[str] | None = None,
+) -> list[ModbusRegisterRange]:
+    """Compute the cheapest set of read requests covering all used registers.
+
+    Only registers with a descriptor are read, restricted to enabled_keys if
+    given. Registers of _MODBUS_NON_EMPTY_KEYS are always read, they detect
+    empty data. Consecutive registers are grouped into ranges of at most
+    MODBUS_MAX_READ_COUNT registers such that the sum of request costs and
+    gap register costs is minimal.
+    """
+    regs, non_empty_regs = _used_registers(reg_sets, enabled_keys)
+
+    # cost[j] is the minimal cost to read regs[:j], split[j] the index of the
+    # first register of the last range in that solution.
+    cost = [0] * (len(regs) + 1)
+    split = [0] * (len(regs) + 1)
+    for j in range(1, len(regs) + 1):
+        cost[j] = cost[j - 1] + _MODBUS_REQUEST_COST
+        split[j] = j - 1
+        for i in range(j - 2, -1, -1):
+            span = regs[j - 1] - regs[i] + 1
+            if span > MODBUS_MAX_READ_COUNT:
+                break
+            gaps = span - (j - i)
+            candidate = (
+                cost[i] + _MODBUS_REQUEST_COST + gaps * _MODBUS_GAP_REGISTER_COST
+            )
+            # prefer fewer requests on equal cost
+            if candidate <= cost[j]:
+                cost[j] = candidate
+                split[j] = i
+
+    ranges: list[ModbusRegisterRange] = []
+    j = len(regs)
+    while j > 0:
+        i = split[j]
+        first_reg, last_reg = regs[i], regs[j - 1]
+        sentinels = sorted(r for r in non_empty_regs if first_reg <= r <= last_reg)
+        ranges.append(
+            ModbusRegisterRange(
+                first_reg=first_reg,
+                last_reg=last_reg,
+                non_empty_reg=sentinels[0] if sentinels else None,
+            )
+        )
+        j = i
+    ranges.reverse()
+    return ranges
+
 
 # The total size of the modbus register space used.
-MODBUS_REGISTER_SIZE = MODBUS_REGISTER_RANGES[-1].last_reg + 1
+MODBUS_REGISTER_SIZE = max(
+    reg_set.base + len(reg_set.descriptors) for reg_set in MODBUS_ENTITY_DESCRIPTIONS
+)
+
+# Sentinel read along with registers without one, and its register set.
+MODBUS_SENTINEL_KEY = "controller_v"
+MODBUS_SENTINEL_REGISTER_SET = _MODBUS_TELEMETRY_GENERAL
+
+# Read requests covering all registers. Clients only reading a subset of
+# registers plan their own ranges.
+MODBUS_REGISTER_RANGES = plan_register_ranges(MODBUS_ENTITY_DESCRIPTIONS)
 
 ENTITY_DESCRIPTIONS: list[EntityDescription] = [
     # ------- general system state
@@ -1279,3 +1458,38 @@ ENTITY_DESCRIPTIONS: list[EntityDescription] = [
     _sensor_day_backup6_out_hw,
     _sensor_day_backup3_in_hw,
 ]
+
+# Diagnostics of the poll cycles. Stage sensors show the 95th percentile
+# of the recent durations, counters the events since start.
+POLL_STATS_ENTITY_DESCRIPTIONS: list[XtPollStatsSensorEntityDescription] = [
+    *(
+        XtPollStatsSensorEntityDescription(
+            key=f"poll_time_{stage}",
+            stage=stage,
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        )
+        for stage in (
+            STAGE_CYCLE,
+            STAGE_CONNECT,
+            STAGE_MODBUS_READ,
+            STAGE_REST_REQUEST,
+            STAGE_REST_PARSE,
+            STAGE_DECODE,
+            STAGE_FANOUT,
+        )
+    ),
+    *(
+        XtPollStatsSensorEntityDescription(
+            key=f"poll_count_{counter}",
+            counter=counter,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        )
+        for counter in COUNTERS
+    ),
+]
@@ -0,0 +1,107 @@
+"""Timings and event counters of the poll cycles of a client."""
+
+import math
+import time
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Stages of a poll cycle. The coordinator times the whole cycle and the
+# entity fan-out, the clients time the stages in between.
+STAGE_CYCLE = "cycle"
+STAGE_CONNECT = "connect"
+STAGE_MODBUS_READ = "modbus_read"
+STAGE_REST_REQUEST = "rest_request"
+STAGE_REST_PARSE = "rest_parse"
+STAGE_DECODE = "decode"
+STAGE_FANOUT = "fanout"
+
+# Events counted since start
+COUNTER_BUSY = "busy"
+COUNTER_TIMEOUT = "timeout"
+COUNTER_EMPTY_DATA = "empty_data"
+COUNTER_RECONNECT = "reconnect"
+
+COUNTERS = (COUNTER_BUSY, COUNTER_TIMEOUT, COUNTER_EMPTY_DATA, COUNTER_RECONNECT)
+
+# Number of most recent samples the percentiles of a stage are taken of.
+# Modbus records a sample per register range, so this covers some cycles.
+_WINDOW = 128
+
+
+class RollingTimings:
+    """Most recent durations of a stage, in a fixed size ring buffer."""
+
+    def __init__(self, window: int = _WINDOW) -> None:
+        """Class constructor."""
+        self._samples = array("d", bytes(8 * window))
+        self._next = 0
+        self.count = 0
+        self.last = math.nan
+
+    def add(self, seconds: float) -> None:
+        """Add the duration of one sample."""
+        self._samples[self._next] = seconds
+        self._next = (self._next + 1) % len(self._samples)
+        self.count += 1
+        self.last = seconds
+
+    def _window(self) -> list[float]:
+        return sorted(self._samples[: min(self.count, len(self._samples))])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the last, p50, p95 and max duration in ms of the window."""
+        samples = self._window()
+        if not samples:
+            return {"count": 0}
+
+        def percentile(q: int) -> float:
+            rank = max(math.ceil(q / 100 * len(samples)), 1)
+            return round(1000 * samples[rank - 1], 3)
+
+        return {
+            "count": self.count,
+            "last_ms": round(1000 * self.last, 3),
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "max_ms": round(1000 * samples[-1], 3),
+        }
+
+
+class PollStats:
+    """Timings by stage and counters of a client and its coordinator."""
+
+    def __init__(self, stages: tuple[str, ...]) -> None:
+        """Class constructor, stages are those timed by the client."""
+        self.timings = {
+            stage: RollingTimings()
+            for stage in (STAGE_CYCLE, *stages, STAGE_DECODE, STAGE_FANOUT)
+        }
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record the duration of a stage."""
+        self.timings[stage].add(seconds)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Record the time spent in a block, also if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage].add(time.perf_counter() - start)
+
+    def count(self, counter: str) -> None:
+        """Count an event."""
+        self.counters[counter] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get all timings and counters, for diagnostics."""
+        return {
+            "timings": {
+                stage: timings.as_dict() for stage, timings in self.timings.items()
+            },
+            "counters": dict(self.counters),
+        }
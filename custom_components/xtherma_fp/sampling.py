@@ -0,0 +1,105 @@
+"""Sampling of fast changing values between updates of the coordinator."""
+
+import math
+from array import array
+from dataclasses import dataclass
+
+# Number of samples kept per key. At a sample interval of 2 s this covers
+# several poll intervals, older samples of longer windows are dropped.
+SAMPLE_CAPACITY = 128
+
+
+@dataclass(frozen=True, slots=True)
+class SampleWindow:
+    """Aggregate of the samples of a key between two updates."""
+
+    count: int
+    min: float
+    max: float
+    # time weighted mean of the values interpolated between samples
+    mean: float
+    # integral of the value over the window in value * seconds, e.g. Ws
+    integral: float
+    duration: float
+
+
+class SampleRing:
+    """Timestamped samples of one key in a fixed size ring buffer."""
+
+    def __init__(self, capacity: int = SAMPLE_CAPACITY) -> None:
+        """Class constructor."""
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self.count = 0
+
+    def add(self, time: float, value: float) -> None:
+        """Add a sample taken at a time in seconds."""
+        self._times[self._next] = time
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._times)
+        self.count = min(self.count + 1, len(self._times))
+
+    def _ordered(self) -> tuple[array, array]:
+        """Get times and values of the samples, oldest first."""
+        start = (self._next - self.count) % len(self._times)
+        if start + self.count <= len(self._times):
+            end = start + self.count
+            return self._times[start:end], self._values[start:end]
+        return (
+            self._times[start:] + self._times[: self._next],
+            self._values[start:] + self._values[: self._next],
+        )
+
+    def window(self) -> SampleWindow | None:
+        """Aggregate all samples, None if there are none."""
+        if not self.count:
+            return None
+        times, values = self._ordered()
+        # interpolate linearly between samples (trapezoid rule)
+        integral = math.fsum(
+            (values[i] + values[i + 1]) / 2 * (times[i + 1] - times[i])
+            for i in range(self.count - 1)
+        )
+        duration = times[-1] - times[0]
+        mean = integral / duration if duration > 0 else math.fsum(values) / self.count
+        return SampleWindow(
+            count=self.count,
+            min=min(values),
+            max=max(values),
+            mean=mean,
+            integral=integral,
+            duration=duration,
+        )
+
+    def restart(self) -> None:
+        """Start the next window with the last sample."""
+        if self.count:
+            self.count = 1
+
+
+class FastSampler:
+    """Samples some keys at a high rate and aggregates them per update."""
+
+    def __init__(self, keys: list[str]) -> None:
+        """Class constructor."""
+        self.keys = keys
+        self._rings = {key: SampleRing() for key in keys}
+
+    def add(self, time: float, values: dict[str, float]) -> None:
+        """Add the sampled values of our keys."""
+        for key, ring in self._rings.items():
+            value = values.get(key)
+            if value is not None:
+                ring.add(time, value)
+
+    def publish(self, time: float, values: dict[str, float]) -> dict[str, SampleWindow]:
+        """Add the values of an update and aggregate the windows it closes."""
+        self.add(time, values)
+        windows = {}
+        for key, ring in self._rings.items():
+            window = ring.window()
+            if window is not None:
+                windows[key] = window
+            ring.restart()
+        return windows
@@ -1,20 +1,38 @@
 """The xtherma integration sensors."""
 
 import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from . import XthermaConfigEntry
+from .const import (
+    EXTRA_STATE_ATTRIBUTE_ENERGY,
+    EXTRA_STATE_ATTRIBUTE_MAX,
+    EXTRA_STATE_ATTRIBUTE_MEAN,
+    EXTRA_STATE_ATTRIBUTE_MIN,
+    EXTRA_STATE_ATTRIBUTE_SAMPLES,
+)
 from .coordinator import XthermaDataUpdateCoordinator
 from .entity import XthermaCoordinatorEntity
 from .entity_descriptors import (
+    POLL_STATS_ENTITY_DESCRIPTIONS,
+    XtPollStatsSensorEntityDescription,
     XtSensorEntityDescription,
     XtVersionSensorEntityDescription,
 )
 
+if TYPE_CHECKING:
+    from .sampling import SampleWindow
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -44,6 +62,13 @@ async def async_setup_entry(
         _LOGGER.debug('Adding sensor "%s"', desc.key)
         sensors.append(sensor)
 
+    stats = coordinator.stats
+    sensors.extend(
+        XthermaPollStatsSensor(coordinator, xtherma_data.device_info, desc)
+        for desc in POLL_STATS_ENTITY_DESCRIPTIONS
+        if desc.stage is None or desc.stage in stats.timings
+    )
+
     _LOGGER.debug("Created %d sensors", len(sensors))
     async_add_entities(sensors)
     return True
@@ -67,6 +92,9 @@ class XthermaSensor(XthermaCoordinatorEntity, SensorEntity):
         self._attr_state_class = description.state_class
         self._attr_options = description.options
         self._factor = description.factor
+        self._published_at: datetime | None = None
+        self._cancel_deferred: CALLBACK_TYPE | None = None
+        self._sample_window: SampleWindow | None = None
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -74,9 +102,78 @@ class XthermaSensor(XthermaCoordinatorEntity, SensorEntity):
         value = self.coordinator.read_value(self.entity_description.key)
         if value is None:
             return
+        self._cancel_deferred_write()
+        now = dt_util.utcnow()
+        published = self._attr_native_value
+        # aggregates of fast sampled keys are published with every update
+        self._sample_window = self.coordinator.sample_windows.get(
+            self.entity_description.key
+        )
+        if (
+            self._sample_window is None
+            and not self.coordinator.publish_all
+            and self._published_at is not None
+            and isinstance(published, (int, float))
+        ):
+            policy = self.coordinator.publish_policy
+            elapsed = now - self._published_at
+            # unchanged values are not notified again, so a held back change
+            # is written later by a timer
+            if not policy.is_significant(
+                self.xt_description, published, value, elapsed
+            ):
+                if value != published and policy.max_silence is not None:
+                    self._defer_write(policy.max_silence - elapsed)
+                return
+            if (delay := policy.delay(published, value, elapsed)) > timedelta(0):
+                self._defer_write(delay)
+                return
         self._attr_native_value = value
+        self._published_at = now
         self.async_write_ha_state()
 
+    @callback
+    def _defer_write(self, delay: timedelta) -> None:
+        """Handle the coordinator data again after a delay."""
+        self._cancel_deferred = async_call_later(
+            self.hass, delay, self._async_deferred_write
+        )
+
+    @callback
+    def _async_deferred_write(self, _now: datetime) -> None:
+        self._cancel_deferred = None
+        self._handle_coordinator_update()
+
+    @callback
+    def _cancel_deferred_write(self) -> None:
+        if self._cancel_deferred is not None:
+            self._cancel_deferred()
+            self._cancel_deferred = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a deferred write."""
+        await super().async_will_remove_from_hass()
+        self._cancel_deferred_write()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return entity specific state attributes, with sample aggregates."""
+        attributes = super().extra_state_attributes
+        window = self._sample_window
+        if window is None:
+            return attributes
+        sample_attributes: dict[str, Any] = {
+            EXTRA_STATE_ATTRIBUTE_SAMPLES: window.count,
+            EXTRA_STATE_ATTRIBUTE_MIN: window.min,
+            EXTRA_STATE_ATTRIBUTE_MEAN: round(window.mean, 3),
+            EXTRA_STATE_ATTRIBUTE_MAX: window.max,
+        }
+        if self.native_unit_of_measurement == UnitOfPower.WATT:
+            sample_attributes[EXTRA_STATE_ATTRIBUTE_ENERGY] = round(
+                window.integral / 3600, 3
+            )
+        return {**(attributes or {}), **sample_attributes}
+
     @property
     def icon(self) -> str | None:
         """Return the icon to use in the frontend, if any."""
@@ -115,3 +212,46 @@ class XthermaVersionSensor(XthermaSensor):
         minor = int((value - major) * 100)
         self._attr_native_value = f"{major}.{minor:02d}"
         self.async_write_ha_state()
+
+
+class XthermaPollStatsSensor(
+    CoordinatorEntity[XthermaDataUpdateCoordinator], SensorEntity
+):
+    """Xtherma Poll Timing or Event Counter Sensor."""
+
+    entity_description: XtPollStatsSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: XthermaDataUpdateCoordinator,
+        device_info: DeviceInfo,
+        description: XtPollStatsSensorEntityDescription,
+    ) -> None:
+        """Class Constructor."""
+        # no context, we are updated after every poll, also failed ones
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_has_entity_name = True
+        self._attr_device_info = device_info
+        self._attr_unique_id = (
+            f"{self.coordinator.config_entry.entry_id}-{description.key}"
+        )
+        self.translation_key = description.key
+
+    @property
+    def available(self) -> bool:
+        """Stay available while polls fail, to show why they fail."""
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        stats = self.coordinator.stats
+        desc = self.entity_description
+        if desc.counter is not None:
+            self._attr_native_value = stats.counters[desc.counter]
+        elif desc.stage is not None:
+            timings = stats.timings[desc.stage].as_dict()
+            self._attr_native_value = timings.get("p95_ms")
+            self._attr_extra_state_attributes = timings
+        self.async_write_ha_state()
@@ -1,11 +1,29 @@
 """Common definitions for Xtherma client variants."""
 
+import math
 from abc import abstractmethod
+from array import array
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any
 
 from homeassistant.helpers.entity import EntityDescription
 
+from .entity_descriptors import XtSensorEntityDescription
+from .poll_stats import PollStats
+
+# Multipliers to apply to raw values by input factor.
+INPUT_FACTORS: dict[str, float] = {
+    "*1000": 1000,
+    "*100": 100,
+    "*10": 10,
+    "1000": 1000,
+    "100": 100,
+    "10": 10,
+    "/1000": 0.001,
+    "/100": 0.01,
+    "/10": 0.1,
+}
+
 
 class XthermaModbusBusyError(Exception):
     """Exception indicating busy on Modbus read or write."""
@@ -80,9 +98,58 @@ class XthermaTimeoutError(Exception):
         super().__init__("timeout")
 
 
+class XthermaSchema:
+    """Precompiled layout of the values delivered by a client.
+
+    Maps each key to its index in the value array of a snapshot and
+    holds the multiplier which scales the raw value of that key.
+    """
+
+    def __init__(self, descriptions: list[EntityDescription]) -> None:
+        """Class constructor."""
+        self.keys: tuple[str, ...] = tuple(desc.key.lower() for desc in descriptions)
+        self.index: dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self.factors: tuple[str | None, ...] = tuple(
+            desc.factor if isinstance(desc, XtSensorEntityDescription) else None
+            for desc in descriptions
+        )
+        self.multipliers = array(
+            "d", (INPUT_FACTORS.get(factor or "", 1.0) for factor in self.factors)
+        )
+        self._empty = array("d", [math.nan]) * len(self.keys)
+
+    def new_snapshot(self) -> "XthermaSnapshot":
+        """Create a snapshot without any values."""
+        return XthermaSnapshot(schema=self, values=array("d", self._empty))
+
+
+@dataclass(slots=True)
+class XthermaSnapshot:
+    """Raw values of one update, indexed like the keys of the schema.
+
+    Values the client did not obtain are NaN.
+    """
+
+    schema: XthermaSchema
+    values: array
+
+    def scaled(self) -> dict[str, float]:
+        """Get all obtained values by key, with their input factor applied."""
+        return {
+            key: value * multiplier
+            for key, value, multiplier in zip(
+                self.schema.keys, self.values, self.schema.multipliers, strict=True
+            )
+            if not math.isnan(value)
+        }
+
+
 class XthermaClient:
     """Base class for Xtherma clients."""
 
+    # timings and counters of the poll cycles, shared with the coordinator
+    stats: PollStats
+
     @abstractmethod
     def update_interval(self) -> timedelta:
         """Return update interval for data coordinator."""
@@ -99,15 +166,41 @@ class XthermaClient:
         raise NotImplementedError
 
     @abstractmethod
-    async def async_get_data(self) -> list[dict[str, Any]]:
+    async def async_get_data(self) -> XthermaSnapshot:
         """Obtain fresh data."""
         raise NotImplementedError
 
+    @abstractmethod
+    def request_full_update(self) -> None:
+        """Obtain all data on next call of async_get_data()."""
+        raise NotImplementedError
+
     @abstractmethod
     async def async_put_data(self, value: int, desc: EntityDescription) -> None:
         """Write data."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def async_put_data_multiple(
+        self, data: list[tuple[EntityDescription, int]]
+    ) -> list[Exception | None]:
+        """Write several values at once.
+
+        Returns the error of each write, or None if it succeeded.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def async_read_back(
+        self, descs: list[EntityDescription], *, detect_empty: bool = False
+    ) -> XthermaSnapshot:
+        """Read current values of some entities, e.g. to verify writes.
+
+        Values of other entities in the snapshot may be stale. With
+        detect_empty, empty data raises like with async_get_data().
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def get_entity_descriptions(self) -> list[EntityDescription]:
         """Get all entity descriptions."""
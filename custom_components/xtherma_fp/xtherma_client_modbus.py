@@ -1,8 +1,15 @@
 """Client to access Modbus server on Xtherma FP module."""
 
+import asyncio
 import logging
+import math
+import time
+from array import array
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any
 
 from homeassistant.components.number import (
     NumberDeviceClass,
@@ -10,20 +17,27 @@ from homeassistant.components.number import (
 from homeassistant.components.sensor import (
     SensorDeviceClass,
 )
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityDescription
+from homeassistant.util.hass_dict import HassKey
 
-from .const import (
-    KEY_ENTRY_INPUT_FACTOR,
-    KEY_ENTRY_KEY,
-    KEY_ENTRY_VALUE,
-    MODBUS_TIMEOUT_S,
-)
+from .const import DOMAIN, MODBUS_TIMEOUT_S
 from .entity_descriptors import (
     MODBUS_ENTITY_DESCRIPTIONS,
-    MODBUS_REGISTER_RANGES,
+    MODBUS_MAX_READ_COUNT,
     MODBUS_REGISTER_SIZE,
+    MODBUS_SENTINEL_KEY,
+    MODBUS_SENTINEL_REGISTER_SET,
+    ModbusRegisterRange,
     ModbusRegisterSet,
-    XtSensorEntityDescription,
+    plan_register_ranges,
+)
+from .poll_stats import (
+    COUNTER_RECONNECT,
+    STAGE_CONNECT,
+    STAGE_DECODE,
+    STAGE_MODBUS_READ,
+    PollStats,
 )
 from .vendor.pymodbus import AsyncModbusTcpClient, ExceptionResponse, ModbusException
 from .xtherma_client_common import (
@@ -33,18 +47,206 @@ from .xtherma_client_common import (
     XthermaModbusEmptyDataError,
     XthermaModbusError,
     XthermaNotConnectedError,
+    XthermaSchema,
+    XthermaSnapshot,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 _MODBUS_MAX_VALUE: int = 65535
-_MODBUS_UPDATE_PERIOD_S: int = 30
+
+# The coordinator polls at the shortest interval of all register sets, each
+# poll reads the register sets which are due.
+_MODBUS_UPDATE_PERIOD_S: int = min(
+    reg_set.poll_interval for reg_set in MODBUS_ENTITY_DESCRIPTIONS
+)
+
+# Slack in seconds when testing whether a register set is due, so that
+# scheduling jitter of the coordinator does not delay reads by a whole period.
+_MODBUS_POLL_SLACK_S: float = 1.0
+
+# Number of read requests we send before waiting for the first response.
+# Responses are matched by their MBAP transaction id.
+_MODBUS_PIPELINE_DEPTH: int = 2
+
+# Maximum number of registers in one write multiple registers request.
+_MODBUS_MAX_WRITE_COUNT: int = 123
+
+
+@dataclass(frozen=True)
+class _ModbusDecodePlan:
+    """Precompiled decoding of the read buffer, indexed like the schema keys."""
+
+    descriptions: list[EntityDescription]
+    schema: XthermaSchema
+    # register address of each key
+    registers: array
+    # 1 if the register of a key holds a two's complement value
+    signed_mask: bytes
+    # key indices of two's complement values
+    signed: tuple[int, ...]
+
+
+# apply two's complement for negative values. For now, only temperatures can be
+# negative.
+def _is_signed(desc: EntityDescription) -> bool:
+    return desc.device_class in (
+        SensorDeviceClass.TEMPERATURE,
+        NumberDeviceClass.TEMPERATURE,
+    )
+
+
+def _compile_decode_plan(reg_sets: list[ModbusRegisterSet]) -> _ModbusDecodePlan:
+    """Compile how to decode the registers of all register sets."""
+    descriptions: list[EntityDescription] = []
+    registers = array("H")
+    for reg_set in reg_sets:
+        for i, desc in enumerate(reg_set.descriptors):
+            if desc is not None:
+                descriptions.append(desc)
+                registers.append(reg_set.base + i)
+    signed_mask = bytes(_is_signed(desc) for desc in descriptions)
+    return _ModbusDecodePlan(
+        descriptions=descriptions,
+        schema=XthermaSchema(descriptions),
+        registers=registers,
+        signed_mask=signed_mask,
+        signed=tuple(i for i, signed in enumerate(signed_mask) if signed),
+    )
+
+
+_MODBUS_DECODE_PLAN = _compile_decode_plan(MODBUS_ENTITY_DESCRIPTIONS)
+
+
+def _group_consecutive(addresses: Iterable[int], max_count: int) -> list[list[int]]:
+    """Group register addresses into blocks of consecutive addresses."""
+    blocks: list[list[int]] = []
+    for address in sorted(addresses):
+        if blocks and blocks[-1][-1] == address - 1 and len(blocks[-1]) < max_count:
+            blocks[-1].append(address)
+        else:
+            blocks.append([address])
+    return blocks
+
+
+class _ModbusConnection:
+    """Modbus TCP connection shared by all clients of one server.
+
+    Requests of the slave addresses using the connection take turns for
+    the pipeline slots, so one busy device cannot starve the others.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """Class constructor."""
+        self.host = host
+        self.port = port
+        self.users = 0
+        self.client = AsyncModbusTcpClient(
+            host=host,
+            port=port,
+            timeout=float(MODBUS_TIMEOUT_S),
+        )
+        self.client.set_pipeline_depth(_MODBUS_PIPELINE_DEPTH)
+        self._connect_lock = asyncio.Lock()
+        self._in_flight = 0
+        # waiting requests by slave address, and the order their turns come
+        self._waiting: dict[int, deque[asyncio.Future[None]]] = {}
+        self._turns: deque[int] = deque()
+
+    async def connect(self) -> bool:
+        """Connect unless connected, concurrent callers share one attempt."""
+        async with self._connect_lock:
+            if self.client.connected:
+                return True
+            _LOGGER.debug("connecting client to %s:%d", self.host, self.port)
+            return await self.client.connect()
+
+    def close(self) -> None:
+        """Close the connection."""
+        _LOGGER.debug("disconnect from %s:%d", self.host, self.port)
+        self.client.close()
+
+    @asynccontextmanager
+    async def turn(self, address: int) -> AsyncIterator[None]:
+        """Wait for a pipeline slot for a request to slave address."""
+        if self._in_flight < _MODBUS_PIPELINE_DEPTH and not self._turns:
+            self._in_flight += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            waiting = self._waiting.setdefault(address, deque())
+            if not waiting:
+                self._turns.append(address)
+            waiting.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    # cancelled after our turn came, pass the slot on
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        """Free a pipeline slot and hand free slots to the next addresses."""
+        self._in_flight -= 1
+        while self._turns and self._in_flight < _MODBUS_PIPELINE_DEPTH:
+            address = self._turns.popleft()
+            waiting = self._waiting[address]
+            future = waiting.popleft()
+            if waiting:
+                self._turns.append(address)
+            else:
+                del self._waiting[address]
+            if not future.done():
+                future.set_result(None)
+                self._in_flight += 1
+
+
+class ModbusConnectionPool:
+    """Modbus TCP connections by (host, port), shared by all clients.
+
+    Many FP modules and gateways accept only a single connection.
+    """
+
+    def __init__(self) -> None:
+        """Class constructor."""
+        self._connections: dict[tuple[str, int], _ModbusConnection] = {}
+
+    def acquire(self, host: str, port: int) -> _ModbusConnection:
+        """Get the connection to a server, creating it if required."""
+        connection = self._connections.get((host, port))
+        if connection is None:
+            connection = _ModbusConnection(host, port)
+            self._connections[(host, port)] = connection
+        connection.users += 1
+        return connection
+
+    def release(self, connection: _ModbusConnection) -> None:
+        """Stop using a connection, the last user closes it."""
+        connection.users -= 1
+        if connection.users == 0:
+            del self._connections[(connection.host, connection.port)]
+            connection.close()
+
+
+_MODBUS_POOL_KEY: HassKey[ModbusConnectionPool] = HassKey(f"{DOMAIN}_modbus_pool")
+
+
+@callback
+def async_get_modbus_pool(hass: HomeAssistant) -> ModbusConnectionPool:
+    """Get the Modbus connection pool of all config entries."""
+    if (pool := hass.data.get(_MODBUS_POOL_KEY)) is None:
+        pool = hass.data[_MODBUS_POOL_KEY] = ModbusConnectionPool()
+    return pool
 
 
 class XthermaClientModbus(XthermaClient):
     """Modbus access client."""
 
-    _client: AsyncModbusTcpClient | None = None
+    _connection: _ModbusConnection | None = None
     detect_empty_modbus_data: bool
 
     def __init__(
@@ -52,30 +254,103 @@ class XthermaClientModbus(XthermaClient):
         host: str,
         port: int,
         address: int,
+        pool: ModbusConnectionPool,
     ) -> None:
         """Class constructor."""
         self._host = host
         self._port = port
         self._address = address
-        self._desc_regset_cache: dict[str, int] = {}
-        self._last_update: list[dict[str, Any]] = []
-        self._read_buffer = [0] * MODBUS_REGISTER_SIZE
+        self._pool = pool
+        self._read_buffer = array("H", bytes(2 * MODBUS_REGISTER_SIZE))
+        self._enabled_keys: set[str] | None = None
+        # key indices of values we do not deliver
+        self._disabled: tuple[int, ...] = ()
+        # read plans by bases of the register sets read
+        self._plan_cache: dict[tuple[int, ...], list[ModbusRegisterRange]] = {}
+        # monotonic time of last successful read by register set base
+        self._last_read: dict[int, float] = {}
+        self._full_read_requested = True
         self.detect_empty_modbus_data = True
+        self.stats = PollStats((STAGE_CONNECT, STAGE_MODBUS_READ))
+
+    def set_enabled_keys(self, keys: set[str] | None) -> None:
+        """Restrict reads to registers of the given keys, None reads all."""
+        if keys == self._enabled_keys:
+            return
+        self._enabled_keys = keys
+        self._plan_cache = {}
+        self._disabled = ()
+        if keys is not None:
+            self._disabled = tuple(
+                i
+                for i, key in enumerate(_MODBUS_DECODE_PLAN.schema.keys)
+                if key not in keys
+            )
+
+    def request_full_update(self) -> None:
+        """Read all register sets on next update, whether they are due or not."""
+        self._full_read_requested = True
+
+    def _due_register_sets(self, now: float) -> list[ModbusRegisterSet]:
+        """Get register sets which need to be read now."""
+        if self._full_read_requested:
+            return MODBUS_ENTITY_DESCRIPTIONS
+        due = []
+        for reg_set in MODBUS_ENTITY_DESCRIPTIONS:
+            last_read = self._last_read.get(reg_set.base)
+            if (
+                last_read is None
+                or now - last_read >= reg_set.poll_interval - _MODBUS_POLL_SLACK_S
+            ):
+                due.append(reg_set)
+        return due
+
+    def _plan(self, reg_sets: list[ModbusRegisterSet]) -> list[ModbusRegisterRange]:
+        """Get read requests for register sets, most important first."""
+        key = tuple(reg_set.base for reg_set in reg_sets)
+        plan = self._plan_cache.get(key)
+        if plan is None:
+            ranges = plan_register_ranges(reg_sets, self._enabled_keys)
+            if ranges and all(r.non_empty_reg is None for r in ranges):
+                # e.g. the fast polled sets, read a sentinel to detect empty data
+                reg_sets = [*reg_sets, MODBUS_SENTINEL_REGISTER_SET]
+                ranges = plan_register_ranges(reg_sets, self._enabled_keys)
+
+            def priority(r: ModbusRegisterRange) -> int:
+                return min(
+                    reg_set.priority
+                    for reg_set in reg_sets
+                    if reg_set.base <= r.last_reg
+                    and r.first_reg < reg_set.base + len(reg_set.descriptors)
+                )
+
+            plan = sorted(ranges, key=priority)
+            self._plan_cache[key] = plan
+            _LOGGER.debug(
+                "planned %d register ranges for sets %s: %s",
+                len(plan),
+                key,
+                ", ".join(f"{r.first_reg}-{r.last_reg}" for r in plan),
+            )
+        return plan
+
+    def _invalidate_register_set(self, address: int) -> None:
+        """Make the register set containing address due on next update."""
+        for reg_set in MODBUS_ENTITY_DESCRIPTIONS:
+            if reg_set.base <= address < reg_set.base + len(reg_set.descriptors):
+                self._last_read.pop(reg_set.base, None)
 
     async def connect(self) -> None:
         """Connect client to server endpoint."""
-        self._client = AsyncModbusTcpClient(
-            host=self._host,
-            port=self._port,
-            timeout=float(MODBUS_TIMEOUT_S),
-        )
+        if self._connection is None:
+            self._connection = self._pool.acquire(self._host, self._port)
         try:
-            _LOGGER.debug("connecting client")
-            result = await self._client.connect()
+            with self.stats.measure(STAGE_CONNECT):
+                result = await self._connection.connect()
             _LOGGER.debug(
                 "connected client success = %s, connected = %s",
                 result,
-                self._client.connected,
+                self._connection.client.connected,
             )
         except Exception as err:
             _LOGGER.exception("connection error")
@@ -85,57 +360,58 @@ class XthermaClientModbus(XthermaClient):
 
     async def disconnect(self) -> None:
         """Disconnect client."""
-        if self._client:
+        if self._connection:
             _LOGGER.debug("disconnect")
-            self._client.close()
-            self._client = None
+            self._pool.release(self._connection)
+            self._connection = None
 
     def update_interval(self) -> timedelta:
         """Return update interval for data coordinator."""
         return timedelta(seconds=_MODBUS_UPDATE_PERIOD_S)
 
-    # apply two's complement for negative values. For now, only temperatures can be
-    # negative.
-    def _decode_int(self, raw_value: int, desc: EntityDescription) -> int:
-        if (
-            desc.device_class
-            in (SensorDeviceClass.TEMPERATURE, NumberDeviceClass.TEMPERATURE)
-            and raw_value > _MODBUS_MAX_VALUE // 2
-        ):
-            return -((raw_value - 1) ^ _MODBUS_MAX_VALUE)
-        return raw_value
-
-    # apply two's complement for negative values. For now, only temperatures can be
-    # negative.
+    def _decode(self) -> XthermaSnapshot:
+        """Decode the read buffer into a snapshot in one pass."""
+        plan = _MODBUS_DECODE_PLAN
+        values = array("d", map(self._read_buffer.__getitem__, plan.registers))
+        # reinterpret the buffer for the few two's complement values
+        signed_buffer = array("h", self._read_buffer.tobytes())
+        for i in plan.signed:
+            values[i] = signed_buffer[plan.registers[i]]
+        for i in self._disabled:
+            values[i] = math.nan
+        return XthermaSnapshot(schema=plan.schema, values=values)
+
     def _encode_int(self, signed_value: int, desc: EntityDescription) -> int:
-        if (
-            desc.device_class
-            in (SensorDeviceClass.TEMPERATURE, NumberDeviceClass.TEMPERATURE)
-            and signed_value < 0
-        ):
+        index = _MODBUS_DECODE_PLAN.schema.index[desc.key.lower()]
+        if _MODBUS_DECODE_PLAN.signed_mask[index] and signed_value < 0:
             return ((-signed_value) ^ _MODBUS_MAX_VALUE) + 1
         return signed_value
 
-    async def _get_client(self) -> AsyncModbusTcpClient:
-        if self._client is None or not self._client.connected:
+    async def _get_connection(self) -> _ModbusConnection:
+        if self._connection is None or not self._connection.client.connected:
             _LOGGER.debug("not connected, try connecting")
+            if self._connection is not None:
+                # we were connected before, the connection was lost
+                self.stats.count(COUNTER_RECONNECT)
             await self.connect()
             # the following check is only for safety and ruff, self.connect() will have
             # alredy raised an exception if the reconnect fails
-            if self._client is None or not self._client.connected:
+            if self._connection is None or not self._connection.client.connected:
                 raise XthermaNotConnectedError
-        return self._client
+        return self._connection
 
     async def _read_modbus_range(
-        self, client: AsyncModbusTcpClient, address: int, length: int
+        self, connection: _ModbusConnection, address: int, length: int
     ) -> None:
         """Read a range of modbus holding registers into read buffer."""
         try:
-            regs = await client.read_holding_registers(
-                address=address,
-                count=length,
-                slave=int(self._address),
-            )
+            async with connection.turn(self._address):
+                with self.stats.measure(STAGE_MODBUS_READ):
+                    regs = await connection.client.read_holding_registers(
+                        address=address,
+                        count=length,
+                        slave=int(self._address),
+                    )
         except ModbusException as err:
             _LOGGER.debug("Modbus exception: %s", err.string)
             raise XthermaModbusError from err
@@ -150,67 +426,72 @@ class XthermaClientModbus(XthermaClient):
                     raise XthermaModbusBusyError
                 _LOGGER.debug("Modbus error %s", regs.exception_code)
                 raise XthermaModbusError
-            self._read_buffer[address : address + length] = regs.registers
+            self._read_buffer[address : address + length] = array("H", regs.registers)
+
+    async def _read_modbus_ranges(
+        self, connection: _ModbusConnection, ranges: list[ModbusRegisterRange]
+    ) -> None:
+        """Read register ranges into read buffer.
 
-    async def _read_modbus_ranges(self, client: AsyncModbusTcpClient) -> None:
-        """Read ranges defined in MODBUS_REGISTER_RANGES into read buffer."""
-        for r in MODBUS_REGISTER_RANGES:
-            await self._read_modbus_range(client, address=r.first_reg, length=r.length)
+        All ranges are requested at once, the client pipelines the requests
+        on its connection and each range is stored as its response arrives.
+        """
+        results = await asyncio.gather(
+            *(
+                self._read_modbus_range(
+                    connection, address=r.first_reg, length=r.length
+                )
+                for r in ranges
+            ),
+            return_exceptions=True,
+        )
+        # report the first failing range, like a sequential read would
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for r in ranges:
             # we know that no single register range can ever be empty, so lets
             # throw an exception if we just read empty data.
             # see also test_modbus_register_ranges_cannot_be_empty()
             if (
                 self.detect_empty_modbus_data
+                and r.non_empty_reg is not None
                 and self._read_buffer[r.non_empty_reg] == 0
             ):
                 raise XthermaModbusEmptyDataError
 
-    async def _read_bank(
-        self,
-        reg_desc: ModbusRegisterSet,
-    ) -> None:
-        """Read a bank of modbus holding registers."""
-        for i, desc in enumerate(reg_desc.descriptors):
-            if not desc:
-                _LOGGER.debug("no descriptor for %d.%d", reg_desc.base, i)
-            else:
-                entry = {}
-                entry[KEY_ENTRY_KEY] = desc.key
-                raw_value = self._read_buffer[reg_desc.base + i]
-                value = self._decode_int(raw_value, desc)
-                entry[KEY_ENTRY_VALUE] = str(value)
-                if isinstance(desc, XtSensorEntityDescription):
-                    entry[KEY_ENTRY_INPUT_FACTOR] = desc.factor
-                else:
-                    entry[KEY_ENTRY_INPUT_FACTOR] = None
-                self._last_update.append(entry)
-
-    async def async_get_data(self) -> list[dict[str, Any]]:
+    async def async_get_data(self) -> XthermaSnapshot:
         """Obtain fresh data."""
-        self._last_update = []
-        client = await self._get_client()
-        await self._read_modbus_ranges(client)
-        for reg_desc in MODBUS_ENTITY_DESCRIPTIONS:
-            await self._read_bank(reg_desc)
-        return self._last_update
+        connection = await self._get_connection()
+        now = time.monotonic()
+        due = self._due_register_sets(now)
+        await self._read_modbus_ranges(connection, self._plan(due))
+        for reg_set in due:
+            self._last_read[reg_set.base] = now
+        self._full_read_requested = False
+        # registers not due keep their last read value in the read buffer
+        with self.stats.measure(STAGE_DECODE):
+            return self._decode()
 
-    async def async_put_data(self, value: int, desc: EntityDescription) -> None:
-        """Write data."""
-        client = await self._get_client()
+    async def _write_modbus_block(
+        self, connection: _ModbusConnection, address: int, values: list[int]
+    ) -> None:
+        """Write values to consecutive holding registers starting at address."""
+        _LOGGER.debug("Writing %s @ address %d", values, address)
         try:
-            address = self._get_register_address(desc.key)
-            encoded_value = self._encode_int(value, desc)
-            _LOGGER.debug(
-                'Writing "%s" = %d @ address %d',
-                desc.key,
-                encoded_value,
-                address,
-            )
-            regs = await client.write_register(
-                address=address,
-                value=encoded_value,
-                slave=int(self._address),
-            )
+            async with connection.turn(self._address):
+                if len(values) == 1:
+                    regs = await connection.client.write_register(
+                        address=address,
+                        value=values[0],
+                        slave=int(self._address),
+                    )
+                else:
+                    regs = await connection.client.write_registers(
+                        address=address,
+                        values=values,
+                        slave=int(self._address),
+                    )
         except Exception as err:
             _LOGGER.exception("Exception error")
             raise XthermaModbusError from err
@@ -222,26 +503,79 @@ class XthermaClientModbus(XthermaClient):
                     raise XthermaModbusBusyError
                 _LOGGER.error("Modbus write error %s", exc_code)
                 raise XthermaModbusError
+            # read back what the device made of it with the next update
+            self._invalidate_register_set(address)
+
+    async def async_put_data(self, value: int, desc: EntityDescription) -> None:
+        """Write data."""
+        (error,) = await self.async_put_data_multiple([(desc, value)])
+        if error is not None:
+            raise error
+
+    async def async_put_data_multiple(
+        self, data: list[tuple[EntityDescription, int]]
+    ) -> list[Exception | None]:
+        """Write data, merging writes of adjacent registers into one request."""
+        connection = await self._get_connection()
+        errors: list[Exception | None] = [None] * len(data)
+        # index into data and encoded value by register address
+        writes: dict[int, tuple[int, int]] = {}
+        for i, (desc, value) in enumerate(data):
+            try:
+                address = self._get_register_address(desc.key)
+            except XthermaModbusError as err:
+                errors[i] = err
+                continue
+            writes[address] = (i, self._encode_int(value, desc))
+        blocks = _group_consecutive(writes, _MODBUS_MAX_WRITE_COUNT)
+        results = await asyncio.gather(
+            *(
+                self._write_modbus_block(
+                    connection, block[0], [writes[address][1] for address in block]
+                )
+                for block in blocks
+            ),
+            return_exceptions=True,
+        )
+        for block, result in zip(blocks, results, strict=True):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+            for address in block:
+                errors[writes[address][0]] = result
+        return errors
+
+    async def async_read_back(
+        self, descs: list[EntityDescription], *, detect_empty: bool = False
+    ) -> XthermaSnapshot:
+        """Read just the registers of some entities, e.g. to verify writes."""
+        connection = await self._get_connection()
+        addresses = {self._get_register_address(desc.key) for desc in descs}
+        sentinel = None
+        if detect_empty and self.detect_empty_modbus_data:
+            sentinel = self._get_register_address(MODBUS_SENTINEL_KEY)
+            addresses.add(sentinel)
+        blocks = _group_consecutive(addresses, MODBUS_MAX_READ_COUNT)
+        results = await asyncio.gather(
+            *(
+                self._read_modbus_range(connection, address=block[0], length=len(block))
+                for block in blocks
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        if sentinel is not None and self._read_buffer[sentinel] == 0:
+            raise XthermaModbusEmptyDataError
+        return self._decode()
 
     def _get_register_address(self, key: str) -> int:
-        if not self._desc_regset_cache:
-            for reg_desc in MODBUS_ENTITY_DESCRIPTIONS:
-                address = reg_desc.base
-                for desc in reg_desc.descriptors:
-                    if desc is not None:
-                        self._desc_regset_cache[desc.key.lower()] = address
-                    address += 1
-        address = self._desc_regset_cache.get(key.lower())
-        if address is None:
+        index = _MODBUS_DECODE_PLAN.schema.index.get(key.lower())
+        if index is None:
             _LOGGER.error("Unknown register %s", key)
             raise XthermaModbusError
-        return address
+        return _MODBUS_DECODE_PLAN.registers[index]
 
     def get_entity_descriptions(self) -> list[EntityDescription]:
         """Get all entity descriptions."""
-        return [
-            desc
-            for reg_desc in MODBUS_ENTITY_DESCRIPTIONS
-            for desc in reg_desc.descriptors
-            if desc is not None
-        ]
+        return list(_MODBUS_DECODE_PLAN.descriptions)
@@ -1,31 +1,202 @@
 """Client to access Fernportal REST API."""
 
 import asyncio
+import hashlib
 import logging
+import time
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from itertools import chain
 from typing import Any
 
 import aiohttp
+from aiohttp import hdrs
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+from homeassistant.util.json import json_loads
 
 from .const import (
+    DOMAIN,
+    FERNPORTAL_DAILY_LIMIT,
     FERNPORTAL_RATE_LIMIT_S,
     FERNPORTAL_TIMEOUT_S,
+    KEY_ENTRY_INPUT_FACTOR,
+    KEY_ENTRY_KEY,
+    KEY_ENTRY_VALUE,
     KEY_SETTINGS,
     KEY_TELEMETRY,
 )
 from .entity_descriptors import ENTITY_DESCRIPTIONS
+from .poll_stats import (
+    STAGE_DECODE,
+    STAGE_REST_PARSE,
+    STAGE_REST_REQUEST,
+    PollStats,
+)
 from .xtherma_client_common import (
+    INPUT_FACTORS,
     XthermaClient,
     XthermaError,
     XthermaReadOnlyError,
     XthermaRestApiError,
     XthermaRestBusyError,
+    XthermaSchema,
+    XthermaSnapshot,
     XthermaTimeoutError,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+_QUOTA_STORAGE_KEY = f"{DOMAIN}_rest_quota"
+_QUOTA_STORAGE_VERSION = 1
+_QUOTA_SAVE_DELAY_S = 60
+
+
+@dataclass(frozen=True)
+class _RestDecodePlan:
+    """Precompiled decoding of REST API entries, indexed like the schema keys."""
+
+    schema: XthermaSchema
+    # key index and expected input factor by key
+    slots: dict[str, tuple[int, str | None]]
+
+
+def _compile_decode_plan(descriptions: list[EntityDescription]) -> _RestDecodePlan:
+    """Compile how to decode the entries of all entity descriptions."""
+    schema = XthermaSchema(descriptions)
+    return _RestDecodePlan(
+        schema=schema,
+        slots={
+            key: (i, factor)
+            for i, (key, factor) in enumerate(
+                zip(schema.keys, schema.factors, strict=True)
+            )
+        },
+    )
+
+
+_REST_DECODE_PLAN = _compile_decode_plan(ENTITY_DESCRIPTIONS)
+
+# Requests per day which scheduled updates leave for refreshes requested
+# by the user and for config flow validations.
+_QUOTA_RESERVE = 30
+
+
+class RestQuota:
+    """Daily request budget of one API key, shared by all its users.
+
+    The budget is reset at midnight UTC. Scheduled updates spread what is
+    left of the budget evenly over the rest of the day, refreshes requested
+    by the user may borrow from it ahead of schedule.
+    """
+
+    def __init__(self, manager: "RestQuotaManager", day: str, used: int) -> None:
+        """Class constructor."""
+        self._manager = manager
+        self.day = day
+        self.used = used
+        self.users = 0
+
+    def _roll_over(self, now: datetime) -> None:
+        """Start a new budget at midnight."""
+        day = now.date().isoformat()
+        if day != self.day:
+            self.day = day
+            self.used = 0
+            self._manager.async_schedule_save()
+
+    @property
+    def remaining(self) -> int:
+        """Get the number of requests left today."""
+        self._roll_over(dt_util.utcnow())
+        return max(FERNPORTAL_DAILY_LIMIT - self.used, 0)
+
+    def interval(self) -> timedelta:
+        """Get the poll interval of each user spreading the budget evenly."""
+        now = dt_util.utcnow()
+        self._roll_over(now)
+        midnight = datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time(), UTC
+        )
+        scheduled = FERNPORTAL_DAILY_LIMIT - _QUOTA_RESERVE - self.used
+        if scheduled <= 0:
+            # budget spent, wait for the next day
+            return max(midnight - now, timedelta(seconds=FERNPORTAL_RATE_LIMIT_S))
+        seconds = (midnight - now).total_seconds() * max(self.users, 1) / scheduled
+        return timedelta(seconds=max(seconds, FERNPORTAL_RATE_LIMIT_S))
+
+    def consume(self, *, borrow: bool) -> bool:
+        """Count a request if the budget allows it.
+
+        Borrowing requests may also use the reserve.
+        """
+        self._roll_over(dt_util.utcnow())
+        limit = (
+            FERNPORTAL_DAILY_LIMIT
+            if borrow
+            else FERNPORTAL_DAILY_LIMIT - _QUOTA_RESERVE
+        )
+        if self.used >= limit:
+            return False
+        self.used += 1
+        self._manager.async_schedule_save()
+        return True
+
+
+class RestQuotaManager:
+    """Request budgets by API key, stored across restarts."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Class constructor."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, _QUOTA_STORAGE_VERSION, _QUOTA_STORAGE_KEY
+        )
+        self._quotas: dict[str, RestQuota] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def async_get(self, api_key: str) -> RestQuota:
+        """Get the budget of an API key."""
+        async with self._load_lock:
+            if self._quotas is None:
+                stored = await self._store.async_load() or {}
+                self._quotas = {
+                    key_id: RestQuota(self, day=entry["day"], used=entry["used"])
+                    for key_id, entry in stored.items()
+                }
+        # do not store the API key itself
+        key_id = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        quota = self._quotas.get(key_id)
+        if quota is None:
+            quota = RestQuota(self, day=dt_util.utcnow().date().isoformat(), used=0)
+            self._quotas[key_id] = quota
+        return quota
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Store budgets soon, and latest when Home Assistant stops."""
+        self._store.async_delay_save(self._data_to_save, _QUOTA_SAVE_DELAY_S)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        return {
+            key_id: {"day": quota.day, "used": quota.used}
+            for key_id, quota in (self._quotas or {}).items()
+        }
+
+
+_QUOTA_MANAGER_KEY: HassKey[RestQuotaManager] = HassKey(f"{DOMAIN}_rest_quota")
+
+
+async def async_get_rest_quota(hass: HomeAssistant, api_key: str) -> RestQuota:
+    """Get the request budget of an API key, shared by all config entries."""
+    if (manager := hass.data.get(_QUOTA_MANAGER_KEY)) is None:
+        manager = hass.data[_QUOTA_MANAGER_KEY] = RestQuotaManager(hass)
+    return await manager.async_get(api_key)
+
 
 class XthermaClientRest(XthermaClient):
     """REST API access client."""
@@ -36,45 +207,129 @@ class XthermaClientRest(XthermaClient):
         api_key: str,
         serial_number: str,
         session: aiohttp.ClientSession,
+        quota: RestQuota | None = None,
     ) -> None:
         """Class constructor."""
         self._url = f"{url}/{serial_number}"
-        self._api_key = api_key
         self._session = session
+        self._timeout = aiohttp.ClientTimeout(total=FERNPORTAL_TIMEOUT_S)
+        self._headers = {hdrs.AUTHORIZATION: f"Bearer {api_key}"}
+        # validators and data of the last response, for conditional requests
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._last_snapshot: XthermaSnapshot | None = None
+        self._quota = quota
+        self._connected = False
+        # the first request, e.g. after a restart, may use the reserve
+        self._borrow = True
+        self.stats = PollStats((STAGE_REST_REQUEST, STAGE_REST_PARSE))
 
     def update_interval(self) -> timedelta:
         """Return update interval for data coordinator."""
+        if self._quota is not None:
+            return self._quota.interval()
         return timedelta(seconds=FERNPORTAL_RATE_LIMIT_S)
 
     async def connect(self) -> None:
-        """Not required for REST."""
+        """Start sharing the request budget of our API key."""
+        if self._quota is not None and not self._connected:
+            self._quota.users += 1
+        self._connected = True
 
     async def disconnect(self) -> None:
-        """Not required for REST."""
+        """Stop sharing the request budget of our API key."""
+        if self._quota is not None and self._connected:
+            self._quota.users -= 1
+        self._connected = False
+
+    def request_full_update(self) -> None:
+        """Let the next request borrow from the budget, we always get all data."""
+        self._borrow = True
 
     def _now(self) -> int:
         return int(datetime.now(UTC).timestamp())
 
-    async def async_get_data(self) -> list[dict[str, Any]]:
+    def _decode(self, *sections: list[dict[str, Any]]) -> XthermaSnapshot:
+        """Decode sections of REST API entries into a snapshot."""
+        plan = _REST_DECODE_PLAN
+        snapshot = plan.schema.new_snapshot()
+        values = snapshot.values
+        slots = plan.slots
+        for entry in chain.from_iterable(sections):
+            key = entry.get(KEY_ENTRY_KEY)
+            slot = slots.get(key)
+            if slot is None:
+                # keys are lower case, anything else is rare
+                key = str(key).lower()
+                slot = slots.get(key)
+                if slot is None:
+                    _LOGGER.debug('Ignoring unknown key="%s"', key)
+                    continue
+            index, factor = slot
+            rawvalue = entry.get(KEY_ENTRY_VALUE)
+            if rawvalue is None:
+                _LOGGER.error("entry incomplete: %s", entry)
+                continue
+            value = float(rawvalue)
+            inputfactor = entry.get(KEY_ENTRY_INPUT_FACTOR) or None
+            if inputfactor != factor:
+                # server disagrees with our schema, honour the server
+                _LOGGER.debug(
+                    'Unexpected inputfactor="%s" for key="%s"', inputfactor, key
+                )
+                value *= INPUT_FACTORS.get(inputfactor or "", 1.0)
+                value /= plan.schema.multipliers[index]
+            values[index] = value
+        return snapshot
+
+    def _request_headers(self) -> dict[str, str]:
+        """Get request headers, asking the server to skip unchanged data."""
+        if self._last_snapshot is None:
+            return self._headers
+        headers = dict(self._headers)
+        if self._etag is not None:
+            headers[hdrs.IF_NONE_MATCH] = self._etag
+        if self._last_modified is not None:
+            headers[hdrs.IF_MODIFIED_SINCE] = self._last_modified
+        return headers
+
+    async def _read_response(self, response: aiohttp.ClientResponse) -> XthermaSnapshot:
+        """Decode a response, or reuse the last data if it did not change."""
+        if response.status == HTTPStatus.NOT_MODIFIED and self._last_snapshot:
+            _LOGGER.debug("Data not modified since last request")
+            return self._last_snapshot
+        with self.stats.measure(STAGE_REST_PARSE):
+            json_data: dict[str, Any] = await response.json(loads=json_loads)
+        telemetry = json_data.get(KEY_TELEMETRY)
+        if not isinstance(telemetry, list):
+            _LOGGER.error("Telemetry in REST API is not a list")
+            return _REST_DECODE_PLAN.schema.new_snapshot()
+        settings = json_data.get(KEY_SETTINGS)
+        if not isinstance(settings, list):
+            _LOGGER.error("Settings in REST API is not a list")
+            return _REST_DECODE_PLAN.schema.new_snapshot()
+        with self.stats.measure(STAGE_DECODE):
+            snapshot = self._decode(telemetry, settings)
+        self._etag = response.headers.get(hdrs.ETAG)
+        self._last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+        self._last_snapshot = snapshot
+        return snapshot
+
+    async def async_get_data(self) -> XthermaSnapshot:
         """Obtain fresh data."""
-        headers = {"Authorization": f"Bearer {self._api_key}"}
+        borrow, self._borrow = self._borrow, False
+        if self._quota is not None and not self._quota.consume(borrow=borrow):
+            _LOGGER.debug("Daily request budget of API key is spent")
+            raise XthermaRestBusyError
         try:
-            timeout = aiohttp.ClientTimeout(total=FERNPORTAL_TIMEOUT_S)
+            start = time.perf_counter()
             async with self._session.get(
-                self._url, timeout=timeout, headers=headers
+                self._url, timeout=self._timeout, headers=self._request_headers()
             ) as response:
+                # until the headers arrived, the body is read when parsing
+                self.stats.record(STAGE_REST_REQUEST, time.perf_counter() - start)
                 response.raise_for_status()
-                json_data: dict[str, Any] = await response.json()
-                telemetry = json_data.get(KEY_TELEMETRY)
-                if not isinstance(telemetry, list):
-                    _LOGGER.error("Telemetry in REST API is not a list")
-                    return []
-                settings = json_data.get(KEY_SETTINGS)
-                if not isinstance(settings, list):
-                    _LOGGER.error("Settings in REST API is not a list")
-                    return []
-                telemetry.extend(settings)
-                return telemetry
+                return await self._read_response(response)
         except aiohttp.ClientResponseError as err:
             _LOGGER.debug("API error: %s", err)
             if err.status == 429:  # noqa: PLR2004
@@ -86,7 +341,6 @@ class XthermaClientRest(XthermaClient):
         except Exception as err:
             _LOGGER.debug("Unknown API error %s", err)
             raise XthermaError from err
-        return []
 
     async def async_put_data(self, value: int, desc: EntityDescription) -> None:
         """Write data."""
@@ -95,6 +349,20 @@ class XthermaClientRest(XthermaClient):
         _LOGGER.debug("Cannot write values using REST API connection")
         raise XthermaReadOnlyError
 
+    async def async_put_data_multiple(
+        self, data: list[tuple[EntityDescription, int]]
+    ) -> list[Exception | None]:
+        """Write several values at once."""
+        _LOGGER.debug("Cannot write values using REST API connection")
+        return [XthermaReadOnlyError() for _ in data]
+
+    async def async_read_back(
+        self, descs: list[EntityDescription], *, detect_empty: bool = False
+    ) -> XthermaSnapshot:
+        """Not supported, values cannot be written using REST API."""
+        del descs, detect_empty
+        raise XthermaReadOnlyError
+
     def get_entity_descriptions(self) -> list[EntityDescription]:
         """Get all entity descriptions."""
         return ENTITY_DESCRIPTIONS
@@ -0,0 +1 @@
+"""Benchmarks for the xtherma custom component."""
@@ -0,0 +1,30 @@
+"""Fixtures for benchmarks.
+
+Benchmarks are sync tests driving the event loop of the hass fixture
+themselves, so each round is timed from start to finish.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from .helpers import DEVICE_COUNTS, fake_create_connection, modbus_registers
+
+
+@pytest.fixture(params=DEVICE_COUNTS, ids=lambda count: f"{count}dev")
+def devices(request: pytest.FixtureRequest) -> int:
+    """Number of devices to benchmark with."""
+    return request.param
+
+
+@pytest.fixture
+def fake_modbus_server(hass):
+    """Let Modbus clients connect to an in memory device.
+
+    The whole vendored pymodbus client stack runs, only the socket is
+    replaced, see FakeModbusTransport.
+    """
+    with patch.object(
+        hass.loop, "create_connection", fake_create_connection(modbus_registers())
+    ):
+        yield
@@ -0,0 +1,204 @@
+"""Harness running a fleet of simulated FP modules against one Home Assistant.
+
+The simulators run in a thread with their own event loop, so the CPU time
+measured on the event loop of Home Assistant is that of the integration.
+"""
+
+import asyncio
+import gc
+import math
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import psutil
+from homeassistant.const import (
+    CONF_ADDRESS,
+    CONF_PORT,
+    EVENT_STATE_CHANGED,
+    EVENT_STATE_REPORTED,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+
+from custom_components.xtherma_fp.coordinator import XthermaDataUpdateCoordinator
+from tests.conftest import init_modbus_integration
+from tests.simulator import FpSimulator, SimulatorConfig
+
+# Simulated devices each listen on their own port, or share one port
+# using different slave addresses.
+LAYOUT_PORTS = "ports"
+LAYOUT_SLAVES = "slaves"
+
+# Values change with every poll cycle, one simulated minute per tick
+_FLEET_SIMULATOR_CONFIG = SimulatorConfig(tick=0.1, time_scale=600.0, seed=0)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Get the q-th percentile (0..100) of values, by nearest rank."""
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class FleetSimulator:
+    """Simulated FP modules served from a thread."""
+
+    def __init__(self, devices: int, layout: str) -> None:
+        """Class constructor."""
+        self.devices = devices
+        self.layout = layout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="fleet simulator"
+        )
+        self._simulators: list[FpSimulator] = []
+        # (port, slave address) of each device
+        self.endpoints: list[tuple[int, int]] = []
+
+    async def _start(self) -> None:
+        if self.layout == LAYOUT_SLAVES:
+            slaves = list(range(1, self.devices + 1))
+            self._simulators = [
+                FpSimulator(slaves=slaves, config=_FLEET_SIMULATOR_CONFIG)
+            ]
+        else:
+            self._simulators = [
+                FpSimulator(config=_FLEET_SIMULATOR_CONFIG) for _ in range(self.devices)
+            ]
+        for simulator in self._simulators:
+            await simulator.start()
+            self.endpoints.extend((simulator.port, slave) for slave in simulator.slaves)
+
+    async def _stop(self) -> None:
+        for simulator in self._simulators:
+            await simulator.stop()
+
+    def __enter__(self) -> "FleetSimulator":
+        """Start the simulators."""
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the simulators and the thread."""
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+@dataclass
+class FleetReport:
+    """Measurements of a fleet run."""
+
+    devices: int
+    layout: str
+    setup_s: float = 0.0
+    # memory blocks allocated by Python for setup, and while polling
+    blocks_setup: int = 0
+    blocks_growth: int = 0
+    # memory of the process in MiB after polling
+    rss_mib: float = 0.0
+    # per poll cycle of all devices
+    cpu_ms: list[float] = field(default_factory=list)
+    # per poll of a single device
+    latency_ms: list[float] = field(default_factory=list)
+    state_writes: int = 0
+    duration_s: float = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        """Get the key figures, e.g. to save with benchmark results."""
+        cpu_ms = sum(self.cpu_ms) / len(self.cpu_ms)
+        return {
+            "devices": self.devices,
+            "layout": self.layout,
+            "setup_s": round(self.setup_s, 3),
+            "blocks_per_device": self.blocks_setup // self.devices,
+            "blocks_growth": self.blocks_growth,
+            "rss_mib": round(self.rss_mib, 1),
+            "cpu_per_cycle_ms": round(cpu_ms, 3),
+            "cpu_per_device_ms": round(cpu_ms / self.devices, 3),
+            "latency_p50_ms": round(percentile(self.latency_ms, 50), 3),
+            "latency_p95_ms": round(percentile(self.latency_ms, 95), 3),
+            "latency_p99_ms": round(percentile(self.latency_ms, 99), 3),
+            "latency_max_ms": round(max(self.latency_ms), 3),
+            "state_writes_per_s": round(self.state_writes / self.duration_s, 1),
+        }
+
+
+@callback
+def _any_event(event_data: Mapping[str, Any]) -> bool:
+    return True
+
+
+def _allocated_blocks() -> int:
+    gc.collect()
+    return sys.getallocatedblocks()
+
+
+class FleetHarness:
+    """One config entry per simulated device, polled in cycles."""
+
+    def __init__(self, hass: HomeAssistant, fleet: FleetSimulator) -> None:
+        """Class constructor."""
+        self._hass = hass
+        self._fleet = fleet
+        self._coordinators: list[XthermaDataUpdateCoordinator] = []
+        self.report = FleetReport(devices=fleet.devices, layout=fleet.layout)
+        self._blocks_after_setup = 0
+
+    async def async_setup(self) -> None:
+        """Set up a config entry for each device."""
+        blocks = _allocated_blocks()
+        start = time.perf_counter()
+        entries = await asyncio.gather(
+            *(
+                init_modbus_integration(
+                    self._hass,
+                    None,
+                    config_data={CONF_PORT: port, CONF_ADDRESS: slave},
+                    entry_id=f"fleet_{i}",
+                )
+                for i, (port, slave) in enumerate(self._fleet.endpoints)
+            )
+        )
+        self.report.setup_s = time.perf_counter() - start
+        self._coordinators = [entry.runtime_data.coordinator for entry in entries]
+        self._blocks_after_setup = _allocated_blocks()
+        self.report.blocks_setup = self._blocks_after_setup - blocks
+        self._hass.bus.async_listen(EVENT_STATE_CHANGED, self._count_state_write)
+        self._hass.bus.async_listen(
+            EVENT_STATE_REPORTED, self._count_state_write, event_filter=_any_event
+        )
+
+    @callback
+    def _count_state_write(self, event: Event) -> None:
+        self.report.state_writes += 1
+
+    async def _async_poll(self, coordinator: XthermaDataUpdateCoordinator) -> None:
+        start = time.perf_counter()
+        await coordinator.async_refresh()
+        self.report.latency_ms.append(1000 * (time.perf_counter() - start))
+
+    async def async_poll_cycle(self) -> None:
+        """Poll all devices once and wait for their entities to update."""
+        start = time.perf_counter()
+        cpu = time.thread_time()
+        await asyncio.gather(*(self._async_poll(c) for c in self._coordinators))
+        await self._hass.async_block_till_done()
+        self.report.cpu_ms.append(1000 * (time.thread_time() - cpu))
+        self.report.duration_s += time.perf_counter() - start
+
+    async def async_unload(self) -> None:
+        """Record the memory growth since setup and unload all config entries."""
+        self.report.blocks_growth = _allocated_blocks() - self._blocks_after_setup
+        self.report.rss_mib = psutil.Process().memory_info().rss / 2**20
+        await asyncio.gather(
+            *(
+                self._hass.config_entries.async_unload(c.config_entry.entry_id)
+                for c in self._coordinators
+            )
+        )
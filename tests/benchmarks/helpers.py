@@ -0,0 +1,103 @@
+"""Helpers for benchmarks."""
+
+import asyncio
+import struct
+from collections.abc import Callable, Coroutine
+from typing import TYPE_CHECKING, Any, cast
+
+from homeassistant.core import HomeAssistant
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.xtherma_fp.entity_descriptors import MODBUS_REGISTER_SIZE
+from tests.helpers import load_mock_data, provide_modbus_data
+
+if TYPE_CHECKING:
+    from tests.conftest import MockModbusParamRegisters
+
+# Number of devices the benchmarks are scaled to
+DEVICE_COUNTS = [1, 10, 100]
+
+# MBAP header and read holding registers request
+_MODBUS_REQUEST = struct.Struct(">HHHBBHH")
+# MBAP header and read holding registers response without registers
+_MODBUS_RESPONSE_HEADER = struct.Struct(">HHHBBB")
+
+
+def modbus_registers() -> bytes:
+    """Get all registers of our standard mock data, in network byte order."""
+    registers = [0] * MODBUS_REGISTER_SIZE
+    for read_result in provide_modbus_data()[0]:
+        address = cast("int", read_result["address"])
+        values = cast("MockModbusParamRegisters", read_result["registers"])
+        registers[address : address + len(values)] = values
+    return struct.pack(f">{len(registers)}H", *registers)
+
+
+def rest_response(serial_number: str) -> dict[str, Any]:
+    """Get our standard REST API response for a device."""
+    response = cast("dict[str, Any]", load_mock_data("rest_response.json"))
+    response["serial_number"] = serial_number
+    return response
+
+
+class FakeModbusTransport(asyncio.Transport):
+    """Transport answering read holding registers requests in memory.
+
+    The requests are served from the same register map for every slave
+    address. Responses arrive with the next loop iteration, like from a
+    fast device on the local network.
+    """
+
+    def __init__(self, protocol: asyncio.Protocol, registers: bytes) -> None:
+        """Class constructor."""
+        super().__init__()
+        self._protocol = protocol
+        self._registers = registers
+        self._closing = False
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """Answer the requests in data."""
+        response = bytearray()
+        for offset in range(0, len(data), _MODBUS_REQUEST.size):
+            tid, _, _, slave, function_code, address, count = (
+                _MODBUS_REQUEST.unpack_from(data, offset)
+            )
+            payload = self._registers[2 * address : 2 * (address + count)]
+            response += _MODBUS_RESPONSE_HEADER.pack(
+                tid, 0, len(payload) + 3, slave, function_code, len(payload)
+            )
+            response += payload
+        asyncio.get_running_loop().call_soon(
+            self._protocol.data_received, bytes(response)
+        )
+
+    def is_closing(self) -> bool:
+        """Return whether the transport is closed."""
+        return self._closing
+
+    def close(self) -> None:
+        """Close the transport."""
+        self._closing = True
+
+
+def fake_create_connection(registers: bytes) -> Callable[..., Any]:
+    """Get a replacement of loop.create_connection connecting to registers."""
+
+    async def create_connection(
+        protocol_factory: Callable[[], asyncio.Protocol], *args: Any, **kwargs: Any
+    ) -> tuple[asyncio.Transport, asyncio.Protocol]:
+        protocol = protocol_factory()
+        transport = FakeModbusTransport(protocol, registers)
+        protocol.connection_made(transport)
+        return transport, protocol
+
+    return create_connection
+
+
+def benchmark_async(
+    benchmark: BenchmarkFixture,
+    hass: HomeAssistant,
+    target: Callable[[], Coroutine[Any, Any, Any]],
+) -> Any:
+    """Benchmark an async function on the event loop of Home Assistant."""
+    return benchmark(lambda: hass.loop.run_until_complete(target()))
@@ -0,0 +1,71 @@
+"""Benchmarks for a poll cycle of the coordinator."""
+
+import asyncio
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.xtherma_fp.const import DOMAIN, FERNPORTAL_URL
+from custom_components.xtherma_fp.coordinator import XthermaDataUpdateCoordinator
+from custom_components.xtherma_fp.xtherma_client_common import XthermaClient
+from custom_components.xtherma_fp.xtherma_client_modbus import (
+    ModbusConnectionPool,
+    XthermaClientModbus,
+)
+from custom_components.xtherma_fp.xtherma_client_rest import XthermaClientRest
+from tests.const import MOCK_API_KEY, MOCK_MODBUS_HOST, MOCK_MODBUS_PORT
+
+from .helpers import benchmark_async, rest_response
+
+
+def _coordinators(hass, clients: list[XthermaClient]):
+    coordinators = [
+        XthermaDataUpdateCoordinator(
+            hass, MockConfigEntry(domain=DOMAIN, entry_id=f"bench_{i}"), client
+        )
+        for i, client in enumerate(clients)
+    ]
+    hass.loop.run_until_complete(asyncio.gather(*(c.connect() for c in clients)))
+    return coordinators
+
+
+def _benchmark_update(benchmark, hass, coordinators):
+    async def update_data():
+        for coordinator in coordinators:
+            coordinator._client.request_full_update()  # noqa: SLF001
+        return await asyncio.gather(
+            *(coordinator._async_update_data() for coordinator in coordinators)  # noqa: SLF001
+        )
+
+    results = benchmark_async(benchmark, hass, update_data)
+
+    assert len(results) == len(coordinators)
+    assert results[-1] == results[0]
+    hass.loop.run_until_complete(
+        asyncio.gather(*(coordinator.close() for coordinator in coordinators))
+    )
+
+
+def test_coordinator_update_modbus(hass, benchmark, fake_modbus_server, devices):
+    """Poll all devices sharing one Modbus connection."""
+    pool = ModbusConnectionPool()
+    clients: list[XthermaClient] = [
+        XthermaClientModbus(MOCK_MODBUS_HOST, MOCK_MODBUS_PORT, address, pool)
+        for address in range(1, devices + 1)
+    ]
+    _benchmark_update(benchmark, hass, _coordinators(hass, clients))
+
+
+def test_coordinator_update_rest(hass, benchmark, aioclient_mock, devices):
+    """Poll all devices using the REST API, without request budget."""
+    session = async_get_clientsession(hass)
+    clients: list[XthermaClient] = []
+    for i in range(devices):
+        serial_number = f"FP-04-{i:06}"
+        aioclient_mock.get(
+            f"{FERNPORTAL_URL}/{serial_number}", json=rest_response(serial_number)
+        )
+        clients.append(
+            XthermaClientRest(FERNPORTAL_URL, MOCK_API_KEY, serial_number, session)
+        )
+    _benchmark_update(benchmark, hass, _coordinators(hass, clients))
@@ -0,0 +1,92 @@
+"""Benchmarks for decoding data received from devices."""
+
+import importlib
+import json
+
+from homeassistant.util.json import json_loads
+
+# importing the vendored pymodbus makes it available as pymodbus
+import custom_components.xtherma_fp.vendor.pymodbus  # noqa: F401
+from custom_components.xtherma_fp.const import (
+    FERNPORTAL_URL,
+    KEY_SETTINGS,
+    KEY_TELEMETRY,
+)
+from custom_components.xtherma_fp.entity_descriptors import MODBUS_REGISTER_RANGES
+from custom_components.xtherma_fp.xtherma_client_rest import XthermaClientRest
+from tests.const import MOCK_API_KEY
+
+from .helpers import modbus_registers, rest_response
+
+
+def test_rest_decode(benchmark, devices):
+    """Parse and decode the REST API responses of all devices."""
+    client = XthermaClientRest(FERNPORTAL_URL, MOCK_API_KEY, "FP-04-000000", None)
+    bodies = [
+        json.dumps(rest_response(f"FP-04-{i:06}")).encode() for i in range(devices)
+    ]
+
+    def decode():
+        snapshots = []
+        for body in bodies:
+            data = json_loads(body)
+            snapshots.append(
+                client._decode(data[KEY_TELEMETRY], data[KEY_SETTINGS])  # noqa: SLF001
+            )
+        return snapshots
+
+    snapshots = benchmark(decode)
+
+    assert len(snapshots) == devices
+
+
+def test_modbus_frame_decode(benchmark, devices):
+    """Frame and decode the responses to reading all registers of all devices."""
+    framer_module = importlib.import_module("pymodbus.framer")
+    pdu_module = importlib.import_module("pymodbus.pdu")
+    register_module = importlib.import_module("pymodbus.pdu.register_message")
+    framer = framer_module.FramerSocket(pdu_module.DecodePDU(is_server=False))
+    registers = modbus_registers()
+    stream = bytearray()
+    for slave in range(1, devices + 1):
+        for r in MODBUS_REGISTER_RANGES:
+            response = register_module.ReadHoldingRegistersResponse(
+                dev_id=slave,
+                transaction_id=len(stream) & 0xFFFF,
+                registers=[
+                    int.from_bytes(registers[2 * address : 2 * address + 2])
+                    for address in range(r.first_reg, r.last_reg + 1)
+                ],
+            )
+            stream += framer.buildFrame(response)
+    data = memoryview(stream)
+
+    def decode():
+        pdus = []
+        used = 0
+        while used < len(data):
+            used_len, pdu = framer.processIncomingFrame(data[used:])
+            used += used_len
+            pdus.append(pdu)
+        return pdus
+
+    pdus = benchmark(decode)
+
+    assert len(pdus) == devices * len(MODBUS_REGISTER_RANGES)
+    assert pdus[-1].dev_id == devices
+
+
+def test_register_block_encode_decode(benchmark):
+    """Encode and decode a response with the most registers of one read."""
+    register_module = importlib.import_module("pymodbus.pdu.register_message")
+    registers = [(31 * i) & 0xFFFF for i in range(125)]
+    response = register_module.ReadHoldingRegistersResponse(registers=registers)
+
+    def encode_decode():
+        decoded = register_module.ReadHoldingRegistersResponse()
+        decoded.decode(response.encode())
+        return decoded
+
+    decoded = benchmark(encode_decode)
+
+    assert decoded.registers == registers
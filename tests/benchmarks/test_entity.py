@@ -0,0 +1,45 @@
+"""Benchmarks for updating the entities of all platforms."""
+
+from homeassistant.const import CONF_ADDRESS, EVENT_STATE_CHANGED
+
+from custom_components.xtherma_fp.const import DOMAIN
+from tests.conftest import init_modbus_integration
+
+from .helpers import benchmark_async
+
+
+def test_entity_fan_out(hass, benchmark, fake_modbus_server, devices):
+    """Update the entities of all devices with changed values."""
+    for address in range(1, devices + 1):
+        hass.loop.run_until_complete(
+            init_modbus_integration(
+                hass,
+                None,
+                config_data={CONF_ADDRESS: address},
+                entry_id=f"bench_{address}",
+            )
+        )
+    coordinators = [
+        entry.runtime_data.coordinator
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    ]
+    assert len(coordinators) == devices
+    # alternate between two data sets, so every update changes all values
+    data = [
+        (coordinator.data, {key: value + 1 for key, value in coordinator.data.items()})
+        for coordinator in coordinators
+    ]
+    changes = []
+    hass.bus.async_listen(EVENT_STATE_CHANGED, changes.append)
+    rounds = 0
+
+    async def fan_out():
+        nonlocal rounds
+        rounds += 1
+        for coordinator, values in zip(coordinators, data, strict=True):
+            coordinator.async_set_updated_data(values[rounds % 2])
+        await hass.async_block_till_done()
+
+    benchmark_async(benchmark, hass, fan_out)
+
+    assert len(changes) >= rounds * devices
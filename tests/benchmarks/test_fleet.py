@@ -0,0 +1,28 @@
+"""Benchmarks for a fleet of devices polled by one Home Assistant."""
+
+import pytest
+
+from .fleet import LAYOUT_PORTS, LAYOUT_SLAVES, FleetHarness, FleetSimulator
+
+# poll cycles timed per run, a normal test run polls once
+_FLEET_CYCLES = 10
+
+
+@pytest.mark.parametrize("layout", [LAYOUT_PORTS, LAYOUT_SLAVES])
+def test_fleet_poll_cycle(hass, benchmark, socket_enabled, devices, layout):
+    """Poll all devices of a fleet on localhost, recording the key figures."""
+    with FleetSimulator(devices, layout) as fleet:
+        harness = FleetHarness(hass, fleet)
+        hass.loop.run_until_complete(harness.async_setup())
+
+        benchmark.pedantic(
+            lambda: hass.loop.run_until_complete(harness.async_poll_cycle()),
+            rounds=_FLEET_CYCLES,
+        )
+
+        hass.loop.run_until_complete(harness.async_unload())
+
+    summary = harness.report.summary()
+    benchmark.extra_info.update(summary)
+    assert len(harness.report.latency_ms) == devices * len(harness.report.cpu_ms)
+    assert summary["state_writes_per_s"] > 0
@@ -0,0 +1,32 @@
+"""Benchmarks for the Modbus client."""
+
+import asyncio
+
+from custom_components.xtherma_fp.xtherma_client_modbus import (
+    ModbusConnectionPool,
+    XthermaClientModbus,
+)
+from tests.const import MOCK_MODBUS_HOST, MOCK_MODBUS_PORT
+
+from .helpers import benchmark_async
+
+
+def test_modbus_get_data(hass, benchmark, fake_modbus_server, devices):
+    """Read all registers of all devices sharing one connection."""
+    pool = ModbusConnectionPool()
+    clients = [
+        XthermaClientModbus(MOCK_MODBUS_HOST, MOCK_MODBUS_PORT, address, pool)
+        for address in range(1, devices + 1)
+    ]
+    hass.loop.run_until_complete(asyncio.gather(*(c.connect() for c in clients)))
+
+    async def get_data():
+        for client in clients:
+            client.request_full_update()
+        return await asyncio.gather(*(c.async_get_data() for c in clients))
+
+    snapshots = benchmark_async(benchmark, hass, get_data)
+
+    assert len(snapshots) == devices
+    assert snapshots[-1].scaled() == snapshots[0].scaled()
+    hass.loop.run_until_complete(asyncio.gather(*(c.disconnect() for c in clients)))
@@ -125,8 +125,10 @@ async def init_integration(
 
 type MockModbusParamRegisters = list[int]
 type MockModbusParamExceptionCode = int | None
+type MockModbusParamAddress = int | None
 type MockModbusParamReadResult = dict[
-    str, MockModbusParamRegisters | MockModbusParamExceptionCode
+    str,
+    MockModbusParamRegisters | MockModbusParamExceptionCode | MockModbusParamAddress,
 ]
 # Type of parameter which mock_modbus_tcp_client expects
 type MockModbusParam = list[MockModbusParamReadResult]
@@ -148,6 +150,11 @@ async def mock_modbus_tcp_client(request: pytest.FixtureRequest):
     A result is a dict with the following keys:
     "registers" -> register data
     "exc_code" -> exception to be thrown to the client (optional)
+    "address" -> first register of the read (optional)
+
+    Results are consumed in order. If a result has an address, a call reading
+    from that address takes the first such result instead, so the order in
+    which the client issues concurrent reads does not matter.
     """
     with patch(MODBUS_CLIENT_PATH) as mock_modbus_client:
         # Configure the mock instance that will be returned when AsyncModbusTcpClient() is called.
@@ -181,20 +188,35 @@ async def mock_modbus_tcp_client(request: pytest.FixtureRequest):
             else:
                 mock_read_holding_registers_result.isError = Mock(return_value=False)
                 mock_read_holding_registers_result.exception_code = 0
+            mock_read_holding_registers_result.address = registers_for_this_call.get(
+                "address"
+            )
             mock_results_queue.append(mock_read_holding_registers_result)
-        mock_instance.read_holding_registers = AsyncMock(side_effect=mock_results_queue)
+
+        def read_holding_registers_side_effect(address, **kwargs):
+            for i, result in enumerate(mock_results_queue):
+                if result.address in (None, address):
+                    return mock_results_queue.pop(i)
+            pytest.fail(f"Unexpected read of address {address}")
+
+        mock_instance.read_holding_registers = AsyncMock(
+            side_effect=read_holding_registers_side_effect
+        )
 
         # When `close` is called, it should change the `connected` property back to False.
         def close_side_effect():
             mock_connected_property.return_value = False
 
-        # Mock the `write_registers` method
+        # Mock the `write_register` and `write_registers` methods
         mock_write_register_result = AsyncMock()
         mock_write_register_result.isError = Mock(return_value=False)
         mock_write_register_result.exception_code = 0
         mock_instance.write_register = AsyncMock(
             return_value=mock_write_register_result
         )
+        mock_instance.write_registers = AsyncMock(
+            return_value=mock_write_register_result
+        )
 
         # Mock the `close` method, as it might be called during component teardown or error handling.
         mock_instance.close = Mock(side_effect=close_side_effect)
@@ -207,6 +229,7 @@ async def init_modbus_integration(
     mock_modbus_tcp_client,
     config_data: dict[str, Any] | None = None,
     options: dict[str, Any] | None = None,
+    entry_id: str = MOCK_CONFIG_ENTRY_ID,
 ) -> MockConfigEntry:
     """Integration using Modbus."""
     _config_data: dict[str, Any] = {
@@ -227,7 +250,7 @@ async def init_modbus_integration(
         domain=DOMAIN,
         data=_config_data,
         options=_options,
-        entry_id=MOCK_CONFIG_ENTRY_ID,
+        entry_id=entry_id,
         version=VERSION,
         title="test_entry_xtherma_modbus_config",
         source="user",
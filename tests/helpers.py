@@ -22,8 +22,11 @@ from custom_components.xtherma_fp.const import (
 )
 from custom_components.xtherma_fp.entity_descriptors import (
     MODBUS_ENTITY_DESCRIPTIONS,
+    MODBUS_POLL_INTERVAL_FAST,
     MODBUS_REGISTER_RANGES,
     MODBUS_REGISTER_SIZE,
+    MODBUS_SENTINEL_REGISTER_SET,
+    plan_register_ranges,
 )
 from tests.conftest import (
     MockModbusParam,
@@ -154,7 +157,8 @@ def provide_modbus_data(
     for entry in all_values:
         key = entry[KEY_ENTRY_KEY]
         value = int(str(entry[KEY_ENTRY_VALUE]))
-        set_modbus_register(regs_list, key, value)
+        # registers are unsigned 16 bit, negative values in two's complement
+        set_modbus_register(regs_list, key, value & 0xFFFF)
 
     return param
 
@@ -173,7 +177,40 @@ def provide_empty_modbus_data(
             {
                 "registers": raw_registers[r.first_reg : r.last_reg + 1],
                 "exc_code": exc_code,
+                "address": r.first_reg,
             }
         )
 
     return [regs_list]
+
+
+def provide_fast_modbus_data(param: MockModbusParam) -> MockModbusParam:
+    """Return the read-outs of a poll of the fast polled sets only.
+
+    The registers are taken from a complete read-out.
+    """
+    registers = [0] * MODBUS_REGISTER_SIZE
+    for result in param:
+        address = cast("int", result["address"])
+        regs = cast("MockModbusParamRegisters", result["registers"])
+        registers[address : address + len(regs)] = regs
+    reg_sets = [
+        reg_set
+        for reg_set in MODBUS_ENTITY_DESCRIPTIONS
+        if reg_set.poll_interval == MODBUS_POLL_INTERVAL_FAST
+    ]
+    # the fast sets contain no sentinel, one is read along
+    ranges = plan_register_ranges([*reg_sets, MODBUS_SENTINEL_REGISTER_SET])
+    return [
+        {
+            "registers": registers[r.first_reg : r.last_reg + 1],
+            "exc_code": None,
+            "address": r.first_reg,
+        }
+        for r in ranges
+    ]
+
+
+def provide_empty_fast_modbus_data() -> list[MockModbusParam]:
+    """Return empty Modbus read-outs of a poll of the fast polled sets only."""
+    return [provide_fast_modbus_data(provide_empty_modbus_data()[0])]
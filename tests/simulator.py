@@ -0,0 +1,283 @@
+"""Simulator of Xtherma FP modules on a local Modbus/TCP server.
+
+The simulator runs the vendored pymodbus server, so clients go through
+real sockets, framing and request scheduling. Each slave address is one
+FP module with the register map of MODBUS_ENTITY_DESCRIPTIONS, seeded from
+tests/fixtures/rest_response.json. A simple thermal model keeps the values
+moving, and latency and BUSY responses can be injected.
+
+Run standalone with e.g.
+
+    python -m tests.simulator --port 5020 --slaves 1 2 3 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import logging
+import math
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# importing the vendored pymodbus makes it available as pymodbus
+import custom_components.xtherma_fp.vendor.pymodbus  # noqa: F401
+from custom_components.xtherma_fp.const import (
+    KEY_ENTRY_KEY,
+    KEY_ENTRY_VALUE,
+    KEY_SETTINGS,
+    KEY_TELEMETRY,
+)
+from custom_components.xtherma_fp.entity_descriptors import (
+    MODBUS_ENTITY_DESCRIPTIONS,
+    MODBUS_REGISTER_SIZE,
+)
+from custom_components.xtherma_fp.xtherma_client_common import INPUT_FACTORS
+
+_datastore = importlib.import_module("pymodbus.datastore")
+_pdu = importlib.import_module("pymodbus.pdu")
+_server = importlib.import_module("pymodbus.server")
+
+_LOGGER = logging.getLogger(__name__)
+
+_FIXTURE = Path(__file__).parent / "fixtures" / "rest_response.json"
+
+# register address and scale of each key, e.g. "/10" stores tenths
+_REGISTERS: dict[str, tuple[int, float]] = {
+    desc.key: (
+        reg_set.base + i,
+        INPUT_FACTORS.get(getattr(desc, "factor", None) or "", 1.0),
+    )
+    for reg_set in MODBUS_ENTITY_DESCRIPTIONS
+    for i, desc in enumerate(reg_set.descriptors)
+    if desc is not None
+}
+
+
+def seed_registers() -> list[int]:
+    """Get the register map with the values of the REST API fixture."""
+    registers = [0] * MODBUS_REGISTER_SIZE
+    data = json.loads(_FIXTURE.read_text())
+    for entry in data[KEY_TELEMETRY] + data[KEY_SETTINGS]:
+        if (register := _REGISTERS.get(entry[KEY_ENTRY_KEY])) is not None:
+            registers[register[0]] = int(entry[KEY_ENTRY_VALUE]) & 0xFFFF
+    return registers
+
+
+@dataclass(kw_only=True)
+class SimulatorConfig:
+    """Behaviour of simulated devices."""
+
+    # seconds to process one request, requests to a device are serialized
+    latency: float = 0.0
+    # probability of answering a request with a BUSY exception
+    busy_rate: float = 0.0
+    # seconds between steps of the thermal model, 0 freezes the values
+    tick: float = 1.0
+    # simulated seconds per real second
+    time_scale: float = 1.0
+    seed: int | None = None
+
+
+class ThermalModel:
+    """First order model of a heat pump heating a building.
+
+    The compressor modulates to bring the flow temperature to the heating
+    target, power draw follows the compressor frequency and the efficiency
+    drops with the lift between outdoor and flow temperature.
+    """
+
+    # time constants in seconds of heating and cooling down
+    HEAT_UP_S = 600.0
+    COOL_DOWN_S = 3600.0
+    # period and amplitude of the outdoor temperature swing
+    DAY_S = 86400.0
+    OUTDOOR_SWING = 4.0
+    MAX_FREQUENCY = 90.0
+    # electrical power at maximum frequency in W
+    MAX_POWER = 3000.0
+
+    def __init__(self, registers: list[int]) -> None:
+        """Class constructor."""
+        self._registers = registers
+        self._time = 0.0
+        self._outdoor_mean = self.get("ta")
+
+    def get(self, key: str) -> float:
+        """Get the value of a key, two's complement for temperatures."""
+        address, scale = _REGISTERS[key]
+        raw = self._registers[address]
+        if raw >= 0x8000:
+            raw -= 0x10000
+        return raw * scale
+
+    def set(self, key: str, value: float) -> None:
+        """Set the value of a key."""
+        address, scale = _REGISTERS[key]
+        self._registers[address] = round(value / scale) & 0xFFFF
+
+    def step(self, seconds: float) -> None:
+        """Advance the model by some seconds."""
+        self._time += seconds
+        outdoor = self._outdoor_mean + self.OUTDOOR_SWING * math.sin(
+            2 * math.pi * self._time / self.DAY_S
+        )
+        flow = self.get("tvl")
+        error = self.get("h_target") - flow
+        frequency = min(max(10.0 * error, 0.0), self.MAX_FREQUENCY)
+        if frequency:
+            flow += error * min(seconds / self.HEAT_UP_S, 1.0)
+        else:
+            flow += (outdoor - flow) * min(seconds / self.COOL_DOWN_S, 1.0)
+        power_in = self.MAX_POWER * frequency / self.MAX_FREQUENCY
+        cop = min(max(7.0 - 0.1 * (flow - outdoor), 1.5), 6.0) if frequency else 0.0
+        self.set("ta", outdoor)
+        self.set("tvl", flow)
+        self.set("trl", flow - 5.0 * frequency / self.MAX_FREQUENCY)
+        self.set("vf", frequency)
+        self.set("pk", frequency > 0)
+        self.set("pkl", 100.0 * frequency / self.MAX_FREQUENCY)
+        self.set("in_hp", power_in)
+        self.set("out_hp", power_in * cop)
+        self.set("efficiency_hp", cop)
+
+
+class FpSlaveContext(_datastore.ModbusSlaveContext):
+    """Holding registers of one simulated FP module."""
+
+    def __init__(self, config: SimulatorConfig, rng: random.Random) -> None:
+        """Class constructor."""
+        # pymodbus addresses data blocks from 1
+        block = _datastore.ModbusSequentialDataBlock(1, seed_registers())
+        super().__init__(
+            di=_datastore.ModbusSequentialDataBlock.create(),
+            co=_datastore.ModbusSequentialDataBlock.create(),
+            ir=_datastore.ModbusSequentialDataBlock.create(),
+            hr=block,
+        )
+        self.model = ThermalModel(block.values)
+        self.requests = 0
+        self.busy_responses = 0
+        self._config = config
+        self._rng = rng
+        self._lock = asyncio.Lock()
+
+    async def _process(self) -> bool:
+        """Wait for the device to process a request, False if it is busy."""
+        self.requests += 1
+        if self._rng.random() < self._config.busy_rate:
+            self.busy_responses += 1
+            return False
+        if self._config.latency:
+            async with self._lock:
+                await asyncio.sleep(self._config.latency)
+        return True
+
+    async def async_getValues(  # noqa: N802
+        self, fc_as_hex: int, address: int, count: int = 1
+    ) -> Any:
+        """Read registers."""
+        if not await self._process():
+            return _pdu.ExceptionResponse.SLAVE_BUSY
+        return self.getValues(fc_as_hex, address, count)
+
+    async def async_setValues(  # noqa: N802
+        self, fc_as_hex: int, address: int, values: Any
+    ) -> int | None:
+        """Write registers."""
+        if not await self._process():
+            return _pdu.ExceptionResponse.SLAVE_BUSY
+        return self.setValues(fc_as_hex, address, values)
+
+
+class FpSimulator:
+    """Modbus/TCP server with simulated FP modules as slaves."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        slaves: list[int] | None = None,
+        config: SimulatorConfig | None = None,
+    ) -> None:
+        """Class constructor, port 0 picks a free port on start."""
+        self.host = host
+        self.port = port
+        self.config = config or SimulatorConfig()
+        rng = random.Random(self.config.seed)  # noqa: S311
+        self.slaves = {
+            slave: FpSlaveContext(self.config, rng) for slave in slaves or [1]
+        }
+        self._server = _server.ModbusTcpServer(
+            _datastore.ModbusServerContext(slaves=self.slaves, single=False),
+            address=(host, port),
+        )
+        self._tick_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start serving and running the thermal model."""
+        await self._server.serve_forever(background=True)
+        self.port = self._server.transport.sockets[0].getsockname()[1]
+        if self.config.tick:
+            self._tick_task = asyncio.create_task(self._tick())
+        _LOGGER.info(
+            "Simulating slaves %s on %s:%d", list(self.slaves), self.host, self.port
+        )
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            self._tick_task = None
+        await self._server.shutdown()
+
+    async def __aenter__(self) -> "FpSimulator":
+        """Start the simulator."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the simulator."""
+        await self.stop()
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.tick)
+            for slave in self.slaves.values():
+                slave.model.step(self.config.tick * self.config.time_scale)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    config = SimulatorConfig(
+        latency=args.latency,
+        busy_rate=args.busy_rate,
+        tick=args.tick,
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+    async with FpSimulator(args.host, args.port, args.slaves, config):
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Run the simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--slaves", type=int, nargs="+", default=[1])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--busy-rate", type=float, default=0.0)
+    parser.add_argument("--tick", type=float, default=1.0)
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,11 @@ from pytest_homeassistant_custom_component.common import load_json_value_fixture
 
 from custom_components.xtherma_fp.const import KEY_ENTRY_INPUT_FACTOR
 from custom_components.xtherma_fp.entity_descriptors import (
+    ENTITY_DESCRIPTIONS,
     MODBUS_ENTITY_DESCRIPTIONS,
     XtNumericEntityDescription,
 )
+from custom_components.xtherma_fp.xtherma_client_common import XthermaSchema
 from tests.helpers import find_entry, flatten_mock_data, load_mock_data
 
 
@@ -45,3 +47,13 @@ def test_input_factors():
                 assert desc.factor is None
             else:
                 assert input_factor == desc.factor
+
+
+def test_snapshot_scaled():
+    """Verify snapshots scale raw values and skip values not obtained."""
+    schema = XthermaSchema(ENTITY_DESCRIPTIONS)
+    snapshot = schema.new_snapshot()
+    assert snapshot.scaled() == {}
+    snapshot.values[schema.index["tvl"]] = 215
+    snapshot.values[schema.index["mode"]] = 3
+    assert snapshot.scaled() == {"tvl": 21.5, "mode": 3.0}
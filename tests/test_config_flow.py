@@ -1,6 +1,7 @@
 """Test config flow."""
 
 import asyncio
+from datetime import timedelta
 from typing import TYPE_CHECKING, cast
 from unittest.mock import patch
 
@@ -28,10 +29,14 @@ from custom_components.xtherma_fp.const import (
     CONF_CONNECTION,
     CONF_CONNECTION_MODBUSTCP,
     CONF_CONNECTION_RESTAPI,
+    CONF_DEADBAND_SCALE,
     CONF_DETECT_EMPTY_MODBUS_DATA,
+    CONF_MAX_SILENCE,
+    CONF_MIN_PUBLISH_INTERVAL,
     CONF_SERIAL_NUMBER,
     FERNPORTAL_URL,
 )
+from custom_components.xtherma_fp.coordinator import PublishPolicy
 from custom_components.xtherma_fp.xtherma_client_common import (
     XthermaError,
     XthermaNotConnectedError,
@@ -517,3 +522,26 @@ async def test_options_flow(hass, mock_modbus_tcp_client):
         # check that update_options_listener() was called and has applied
         # the new setting
         assert client.detect_empty_modbus_data == value_to_set
+
+
+@pytest.mark.parametrize("mock_rest_api_client", provide_rest_data(), indirect=True)
+async def test_options_flow_publish_policy(hass, mock_rest_api_client):
+    """Test configuring when sensors publish changes."""
+    entry = await init_integration(hass, mock_rest_api_client)
+    coordinator = entry.runtime_data.coordinator
+    assert coordinator.publish_policy == PublishPolicy()
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_DEADBAND_SCALE: 2.5,
+            CONF_MIN_PUBLISH_INTERVAL: 30,
+            CONF_MAX_SILENCE: 0,
+        },
+    )
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert coordinator.publish_policy == PublishPolicy(
+        deadband_scale=2.5, min_interval=timedelta(seconds=30), max_silence=None
+    )
@@ -0,0 +1,169 @@
+"""Tests for the Xtherma poll statistics and diagnostics."""
+
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from homeassistant.const import EntityCategory
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.xtherma_fp.const import CONF_DETECT_EMPTY_MODBUS_DATA
+from custom_components.xtherma_fp.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.xtherma_fp.poll_stats import RollingTimings
+from custom_components.xtherma_fp.vendor.pymodbus import ExceptionResponse
+from tests.const import MOCK_API_KEY
+from tests.helpers import (
+    provide_empty_fast_modbus_data,
+    provide_modbus_data,
+    provide_rest_data,
+)
+
+from .conftest import init_integration, init_modbus_integration
+
+SENSOR_ENTITY_ID_BUSY = "sensor.test_entry_xtherma_modbus_config_busy_responses"
+SENSOR_ENTITY_ID_EMPTY_DATA = (
+    "sensor.test_entry_xtherma_modbus_config_empty_data_responses"
+)
+SENSOR_ENTITY_ID_CYCLE = "sensor.test_entry_xtherma_modbus_config_poll_cycle_time"
+
+
+def test_rolling_timings():
+    """Verify percentiles are taken of the most recent samples."""
+    timings = RollingTimings(window=4)
+    assert timings.as_dict() == {"count": 0}
+    for ms in (100, 1, 2, 3, 4):
+        timings.add(ms / 1000)
+    assert timings.as_dict() == {
+        "count": 5,
+        "last_ms": 4.0,
+        "p50_ms": 2.0,
+        "p95_ms": 4.0,
+        "max_ms": 4.0,
+    }
+
+
+def _test_modbus_busy_once() -> list:
+    # one good update for the setup, one busy update
+    param = provide_modbus_data()[0]
+    param += provide_modbus_data(exc_code=ExceptionResponse.SLAVE_BUSY)[0]
+    return [param]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_modbus_busy_once(), indirect=True
+)
+async def test_diagnostics_modbus(hass, mock_modbus_tcp_client):
+    """Verify diagnostics show where poll time went and count busy responses."""
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    await entry.runtime_data.coordinator.async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["config_entry"]["data"]["host"] == "**REDACTED**"
+    assert diagnostics["last_update_success"] is False
+    assert diagnostics["poll_state"]["backoff_count"] == 1
+    stats = diagnostics["poll_stats"]
+    assert stats["counters"] == {
+        "busy": 1,
+        "timeout": 0,
+        "empty_data": 0,
+        "reconnect": 0,
+    }
+    timings = stats["timings"]
+    assert list(timings) == ["cycle", "connect", "modbus_read", "decode", "fanout"]
+    assert timings["cycle"]["count"] == 2
+    assert timings["connect"]["count"] == 1
+    assert timings["decode"]["count"] == 1
+    # one sample per register range
+    assert timings["modbus_read"]["count"] > timings["cycle"]["count"]
+    assert timings["fanout"]["p95_ms"] >= 0
+
+
+@pytest.mark.parametrize("mock_rest_api_client", provide_rest_data(), indirect=True)
+async def test_diagnostics_rest_api(hass, mock_rest_api_client):
+    """Verify REST API diagnostics time the request and do not leak the key."""
+    entry = await init_integration(hass, mock_rest_api_client)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert MOCK_API_KEY not in str(diagnostics)
+    timings = diagnostics["poll_stats"]["timings"]
+    assert list(timings) == ["cycle", "rest_request", "rest_parse", "decode", "fanout"]
+    assert timings["rest_request"]["count"] == 1
+    assert timings["rest_parse"]["count"] == 1
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_modbus_busy_once(), indirect=True
+)
+async def test_poll_stats_sensors(
+    hass, entity_registry: er.EntityRegistry, mock_modbus_tcp_client
+):
+    """Verify poll statistics sensors are diagnostic and disabled by default."""
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+
+    entity = entity_registry.async_get(SENSOR_ENTITY_ID_BUSY)
+    assert entity is not None
+    assert entity.entity_category is EntityCategory.DIAGNOSTIC
+    assert entity.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hass.states.get(SENSOR_ENTITY_ID_BUSY) is None
+    # stages of the REST API are not timed by a Modbus client
+    assert not [
+        e.entity_id
+        for e in er.async_entries_for_config_entry(entity_registry, entry.entry_id)
+        if e.unique_id.endswith("-poll_time_rest_request")
+    ]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_modbus_busy_once(), indirect=True
+)
+async def test_poll_stats_sensors_enabled(hass, mock_modbus_tcp_client):
+    """Verify poll statistics sensors stay available while polls fail."""
+    with patch.object(
+        Entity,
+        "entity_registry_enabled_default",
+        new_callable=PropertyMock,
+        return_value=True,
+    ):
+        entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    await entry.runtime_data.coordinator.async_refresh()
+
+    assert hass.states.get(SENSOR_ENTITY_ID_BUSY).state == "1"
+    state = hass.states.get(SENSOR_ENTITY_ID_CYCLE)
+    assert float(state.state) >= 0
+    assert state.attributes["count"] == 2
+    assert state.attributes["unit_of_measurement"] == "ms"
+
+
+def _test_modbus_fast_empty() -> list:
+    # all registers for the setup, then zeros for the fast polled sets
+    return [provide_modbus_data()[0] + provide_empty_fast_modbus_data()[0]]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_modbus_fast_empty(), indirect=True
+)
+async def test_poll_stats_empty_data(hass, mock_modbus_tcp_client, freezer):
+    """Verify empty data of a fast only poll is counted."""
+    with patch.object(
+        Entity,
+        "entity_registry_enabled_default",
+        new_callable=PropertyMock,
+        return_value=True,
+    ):
+        entry = await init_modbus_integration(
+            hass,
+            mock_modbus_tcp_client,
+            options={CONF_DETECT_EMPTY_MODBUS_DATA: True},
+        )
+    coordinator = entry.runtime_data.coordinator
+    assert hass.states.get(SENSOR_ENTITY_ID_EMPTY_DATA).state == "0"
+
+    freezer.tick(coordinator.update_interval)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.stats.counters["empty_data"] == 1
+    assert hass.states.get(SENSOR_ENTITY_ID_EMPTY_DATA).state == "1"
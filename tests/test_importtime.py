@@ -0,0 +1,68 @@
+"""Tests for the modules loaded when importing the integration."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _import_times(*modules: str) -> dict[str, int]:
+    """Import modules in a fresh interpreter using -X importtime.
+
+    Returns the cumulative import time in microseconds by module name.
+    """
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "; ".join(f"import {module}" for module in modules),
+        ],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_without_modbus():
+    """Verify REST API installations do not load the Modbus client."""
+    times = _import_times(
+        "custom_components.xtherma_fp",
+        "custom_components.xtherma_fp.config_flow",
+        "custom_components.xtherma_fp.sensor",
+    )
+    assert "custom_components.xtherma_fp.xtherma_client_rest" in times
+    assert [
+        name
+        for name in times
+        if name.startswith("pymodbus") or name.endswith("xtherma_client_modbus")
+    ] == []
+
+
+def test_import_modbus_client_only():
+    """Verify the Modbus client loads only the TCP parts of pymodbus."""
+    times = _import_times("custom_components.xtherma_fp.xtherma_client_modbus")
+    assert "pymodbus.client.base" in times
+    assert [
+        name
+        for name in times
+        if name.startswith(
+            (
+                "pymodbus.client.serial",
+                "pymodbus.client.tls",
+                "pymodbus.client.udp",
+                "pymodbus.datastore",
+                "pymodbus.server",
+                "pymodbus.transport.serialtransport",
+            )
+        )
+    ] == []
@@ -1,5 +1,6 @@
 """Tests for the Xtherma number platform."""
 
+import asyncio
 from unittest.mock import patch
 
 import pytest
@@ -10,6 +11,7 @@ from homeassistant.exceptions import HomeAssistantError
 from pytest_homeassistant_custom_component.common import snapshot_platform
 
 from custom_components.xtherma_fp.xtherma_client_common import XthermaReadOnlyError
+from tests.conftest import MockModbusParam
 from tests.helpers import provide_modbus_data, provide_rest_data
 
 from .conftest import init_integration, init_modbus_integration
@@ -23,6 +25,10 @@ NUMBER_ENTITY_ID_MODBUS_451 = (
 NUMBER_ENTITY_ID_MODBUS_411 = (
     "number.test_entry_xtherma_modbus_config_heating_curve_2_outside_temperature_low_p1"
 )
+NUMBER_ENTITY_ID_MODBUS_311 = (
+    "number.test_entry_xtherma_modbus_config_heating_curve_1_outside_temperature_low_p1"
+)
+NUMBER_ENTITY_ID_MODBUS_312 = "number.test_entry_xtherma_modbus_config_heating_curve_1_outside_temperature_high_p2"
 
 
 @pytest.mark.parametrize("mock_rest_api_client", provide_rest_data(), indirect=True)
@@ -109,3 +115,218 @@ async def test_set_negative_number_modbus(hass, mock_modbus_tcp_client):
     assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_411).state == "-20.0"
     assert kwargs["value"] == (20 ^ 65535) + 1
     assert kwargs["slave"] == 1
+
+
+# check writes of adjacent registers are sent as one request
+@pytest.mark.parametrize("mock_modbus_tcp_client", provide_modbus_data(), indirect=True)
+async def test_set_adjacent_numbers_modbus(hass, mock_modbus_tcp_client):
+    await init_modbus_integration(hass, mock_modbus_tcp_client)
+
+    await asyncio.gather(
+        *(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_SET_VALUE,
+                {
+                    ATTR_ENTITY_ID: entity_id,
+                    ATTR_VALUE: value,
+                },
+                blocking=True,
+            )
+            for entity_id, value in (
+                (NUMBER_ENTITY_ID_MODBUS_312, 15.0),
+                (NUMBER_ENTITY_ID_MODBUS_311, -5.0),
+            )
+        )
+    )
+
+    mock_modbus_tcp_client.write_register.assert_not_called()
+    mock_modbus_tcp_client.write_registers.assert_called_once()
+    kwargs = mock_modbus_tcp_client.write_registers.call_args.kwargs
+    # verify arguments passed to write_registers()
+    assert kwargs["address"] == 11
+    assert kwargs["values"] == [(5 ^ 65535) + 1, 15]
+    assert kwargs["slave"] == 1
+    assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_311).state == "-5.0"
+    assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_312).state == "15.0"
+
+
+def _provide_read_back_data(*values: int) -> list[MockModbusParam]:
+    """Modbus data followed by reads of register 11 (key 311)."""
+    param = provide_modbus_data()
+    param[0].extend(
+        {"registers": [value & 0xFFFF], "exc_code": None, "address": 11}
+        for value in values
+    )
+    return param
+
+
+def _provide_read_back_data_311_312() -> list[MockModbusParam]:
+    """Modbus data followed by reads of register 11 (key 311) and 12 (key 312)."""
+    param = _provide_read_back_data(-5)
+    param[0].append({"registers": [15], "exc_code": None, "address": 12})
+    return param
+
+
+# check a write requested while a batch is sent goes out with the next batch
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _provide_read_back_data_311_312(), indirect=True
+)
+async def test_set_number_modbus_during_write(hass, mock_modbus_tcp_client):
+    await init_modbus_integration(hass, mock_modbus_tcp_client)
+
+    sending = asyncio.Event()
+    gate = asyncio.Event()
+    write_result = mock_modbus_tcp_client.write_register.return_value
+
+    async def slow_write_register(**kwargs):
+        sending.set()
+        await gate.wait()
+        return write_result
+
+    mock_modbus_tcp_client.write_register.side_effect = slow_write_register
+
+    def set_value(entity_id: str, value: float) -> asyncio.Task:
+        return hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_SET_VALUE,
+                {ATTR_ENTITY_ID: entity_id, ATTR_VALUE: value},
+                blocking=True,
+            )
+        )
+
+    with patch("custom_components.xtherma_fp.coordinator._WRITE_VERIFY_DELAYS_S", (0,)):
+        first = set_value(NUMBER_ENTITY_ID_MODBUS_311, -5.0)
+        await sending.wait()
+        second = set_value(NUMBER_ENTITY_ID_MODBUS_312, 15.0)
+        await asyncio.sleep(0.3)
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(first, second), timeout=5)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    calls = mock_modbus_tcp_client.write_register.call_args_list
+    assert [(c.kwargs["address"], c.kwargs["value"]) for c in calls] == [
+        (11, (5 ^ 65535) + 1),
+        (12, 15),
+    ]
+    assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_312).state == "15.0"
+
+
+# check a write is confirmed as soon as the device reports the written value
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _provide_read_back_data(-9, -5), indirect=True
+)
+async def test_set_number_modbus_verified(hass, mock_modbus_tcp_client):
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    coordinator = entry.runtime_data.coordinator
+
+    with patch(
+        "custom_components.xtherma_fp.coordinator._WRITE_VERIFY_DELAYS_S",
+        (0, 0, 0),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_VALUE,
+            {
+                ATTR_ENTITY_ID: NUMBER_ENTITY_ID_MODBUS_311,
+                ATTR_VALUE: -5.0,
+            },
+            blocking=True,
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    # first read still shows the old value, second one confirms the write
+    reads = [
+        call.kwargs
+        for call in mock_modbus_tcp_client.read_holding_registers.call_args_list
+        if call.kwargs["address"] == 11
+    ]
+    assert [(kwargs["address"], kwargs["count"]) for kwargs in reads] == [
+        (11, 1),
+        (11, 1),
+    ]
+    assert coordinator.data["311"] == -5.0
+    assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_311).state == "-5.0"
+
+
+# check a write the device does not apply is reported and reverted
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _provide_read_back_data(-9, -9), indirect=True
+)
+async def test_set_number_modbus_rejected(hass, mock_modbus_tcp_client, caplog):
+    await init_modbus_integration(hass, mock_modbus_tcp_client)
+
+    with patch(
+        "custom_components.xtherma_fp.coordinator._WRITE_VERIFY_DELAYS_S",
+        (0, 0),
+    ):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_VALUE,
+            {
+                ATTR_ENTITY_ID: NUMBER_ENTITY_ID_MODBUS_311,
+                ATTR_VALUE: -5.0,
+            },
+            blocking=True,
+        )
+        assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_311).state == "-5.0"
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_311).state == "-9.0"
+    assert 'Write of key="311" not confirmed' in caplog.text
+
+
+# check an older verification does not release a newer write of the same key
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _provide_read_back_data(-5, -3), indirect=True
+)
+async def test_set_number_modbus_overlapping(hass, mock_modbus_tcp_client, caplog):
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    coordinator = entry.runtime_data.coordinator
+    client = coordinator._client  # noqa: SLF001
+
+    # each read back reads at once, but only returns once its gate opens
+    first, second = asyncio.Event(), asyncio.Event()
+    gates = [first, second]
+    read_back = client.async_read_back
+
+    async def slow_read_back(descs):
+        gate = gates.pop(0)
+        result = await read_back(descs)
+        await gate.wait()
+        return result
+
+    async def set_value(value: float) -> None:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_VALUE,
+            {ATTR_ENTITY_ID: NUMBER_ENTITY_ID_MODBUS_311, ATTR_VALUE: value},
+            blocking=True,
+        )
+        # let the verification read back
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    with (
+        patch("custom_components.xtherma_fp.coordinator._WRITE_VERIFY_DELAYS_S", (0,)),
+        patch.object(client, "async_read_back", slow_read_back),
+    ):
+        await set_value(-5.0)
+        await set_value(-3.0)
+        newer = coordinator._pending_writes["311"]  # noqa: SLF001
+
+        # the first read back confirms the older write only
+        first.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert coordinator._pending_writes["311"] is newer  # noqa: SLF001
+        assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_311).state == "-3.0"
+
+        second.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator._pending_writes == {}  # noqa: SLF001
+    assert coordinator.data["311"] == -3.0
+    assert hass.states.get(NUMBER_ENTITY_ID_MODBUS_311).state == "-3.0"
+    assert "not confirmed" not in caplog.text
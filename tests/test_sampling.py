@@ -0,0 +1,107 @@
+"""Tests for sampling fast changing values between updates."""
+
+from datetime import timedelta
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.xtherma_fp.const import (
+    CONF_FAST_SAMPLE_INTERVAL,
+    CONF_FAST_SAMPLE_KEYS,
+)
+from custom_components.xtherma_fp.sampling import FastSampler, SampleRing
+from tests.conftest import MockModbusParam
+from tests.helpers import (
+    get_modbus_register_number,
+    provide_modbus_data,
+    set_modbus_register,
+)
+
+from .conftest import init_modbus_integration
+
+SENSOR_ENTITY_ID_MODBUS_IN_HP = (
+    "sensor.test_entry_xtherma_modbus_config_power_consumption_heat_pump_electric"
+)
+
+
+def test_sample_ring():
+    """Verify windows are time weighted and keep the last samples."""
+    ring = SampleRing(capacity=3)
+    assert ring.window() is None
+    for time, value in ((0.0, 99.0), (1.0, 10.0), (2.0, 20.0), (4.0, 20.0)):
+        ring.add(time, value)
+    window = ring.window()
+    assert window is not None
+    # the first sample was dropped
+    assert window.count == 3
+    assert (window.min, window.max) == (10.0, 20.0)
+    assert window.integral == 15.0 + 40.0
+    assert window.duration == 3.0
+    assert window.mean == 55.0 / 3
+
+    ring.restart()
+    window = ring.window()
+    assert window is not None
+    assert (window.count, window.mean, window.integral) == (1, 20.0, 0.0)
+
+
+def test_fast_sampler():
+    """Verify each published window starts with the last sample."""
+    sampler = FastSampler(["in_hp"])
+    sampler.add(0.0, {"in_hp": 100.0, "out_hp": 1.0})
+    windows = sampler.publish(2.0, {"in_hp": 300.0})
+    assert list(windows) == ["in_hp"]
+    assert windows["in_hp"].mean == 200.0
+
+    windows = sampler.publish(4.0, {"in_hp": 300.0})
+    assert windows["in_hp"].count == 2
+    assert windows["in_hp"].min == 300.0
+
+
+def _test_fast_sampling_regs() -> list[MockModbusParam]:
+    # full read-outs for the setup and the refresh, samples in between, each
+    # with the sentinel, the last one is empty
+    address = get_modbus_register_number("in_hp")
+    sentinel = get_modbus_register_number("controller_v")
+    param_setup = provide_modbus_data()[0]
+    param_refresh = provide_modbus_data()[0]
+    set_modbus_register(param_refresh, "in_hp", 200)
+    samples: MockModbusParam = []
+    for value, sentinel_value in ((100, 243), (300, 243), (0, 0)):
+        samples.append({"address": address, "registers": [value]})
+        samples.append({"address": sentinel, "registers": [sentinel_value]})
+    return [param_setup + samples + param_refresh]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_fast_sampling_regs(), indirect=True
+)
+async def test_fast_sampling(hass, mock_modbus_tcp_client, freezer):
+    """Verify samples between updates are published aggregated.
+
+    Empty samples are dropped instead of faking the heat pump switching off.
+    """
+    entry = await init_modbus_integration(
+        hass,
+        mock_modbus_tcp_client,
+        options={CONF_FAST_SAMPLE_INTERVAL: 2, CONF_FAST_SAMPLE_KEYS: ["in_hp"]},
+    )
+    coordinator = entry.runtime_data.coordinator
+
+    for _ in range(3):
+        freezer.tick(timedelta(seconds=2))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    await coordinator.async_refresh()
+
+    state = hass.states.get(SENSOR_ENTITY_ID_MODBUS_IN_HP)
+    # 1000 W and 3000 W sampled 2 s apart, 2000 W read by the update 2 s
+    # later, the empty sample in between is dropped
+    assert state.state == "2250.0"
+    assert state.attributes["samples"] == 3
+    assert state.attributes["min"] == 1000.0
+    assert state.attributes["max"] == 3000.0
+    assert state.attributes["energy_wh"] == round(9000 / 3600, 3)
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    assert coordinator.sample_windows == {}
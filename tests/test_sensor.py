@@ -1,19 +1,41 @@
 """Tests for the Xtherma sensor platform."""
 
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
 from homeassistant.const import Platform
-from pytest_homeassistant_custom_component.common import snapshot_platform
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+    snapshot_platform,
+)
 
+from custom_components.xtherma_fp.const import (
+    CONF_DEADBAND_SCALE,
+    CONF_MIN_PUBLISH_INTERVAL,
+)
+from custom_components.xtherma_fp.coordinator import PublishPolicy
+from custom_components.xtherma_fp.entity_descriptors import XtSensorEntityDescription
 from tests.conftest import MockModbusParam
-from tests.helpers import provide_modbus_data, provide_rest_data, set_modbus_register
+from tests.helpers import (
+    provide_fast_modbus_data,
+    provide_modbus_data,
+    provide_rest_data,
+    set_modbus_register,
+)
 
 from .conftest import init_integration, init_modbus_integration
 
+POLL_STATS_ENTITY_DESCRIPTIONS_PATH = (
+    "custom_components.xtherma_fp.sensor.POLL_STATS_ENTITY_DESCRIPTIONS"
+)
+
 SENSOR_ENTITY_ID_MODBUS_TA = (
     "sensor.test_entry_xtherma_modbus_config_ta_outdoor_temperature"
 )
+SENSOR_ENTITY_ID_MODBUS_TVL = (
+    "sensor.test_entry_xtherma_modbus_config_tvl_flow_temperature"
+)
 
 
 @pytest.mark.parametrize("mock_rest_api_client", provide_rest_data(), indirect=True)
@@ -21,7 +43,11 @@ async def test_setup_sensor_rest_api(
     hass, entity_registry, snapshot, mock_rest_api_client
 ) -> None:
     """Test the setup of sensor platform using REST API."""
-    with patch("custom_components.xtherma_fp._PLATFORMS", [Platform.SENSOR]):
+    # poll statistics sensors are disabled by default, see test_diagnostics
+    with (
+        patch("custom_components.xtherma_fp._PLATFORMS", [Platform.SENSOR]),
+        patch(POLL_STATS_ENTITY_DESCRIPTIONS_PATH, []),
+    ):
         entry = await init_integration(hass, mock_rest_api_client)
 
     await snapshot_platform(hass, entity_registry, snapshot, entry.entry_id)
@@ -32,7 +58,11 @@ async def test_setup_sensor_modbus_tcp(
     hass, entity_registry, snapshot, mock_modbus_tcp_client
 ) -> None:
     """Test the setup of sensor platform using MODBUS TCP."""
-    with patch("custom_components.xtherma_fp._PLATFORMS", [Platform.SENSOR]):
+    # poll statistics sensors are disabled by default, see test_diagnostics
+    with (
+        patch("custom_components.xtherma_fp._PLATFORMS", [Platform.SENSOR]),
+        patch(POLL_STATS_ENTITY_DESCRIPTIONS_PATH, []),
+    ):
         entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
 
     await snapshot_platform(hass, entity_registry, snapshot, entry.entry_id)
@@ -55,3 +85,101 @@ async def test_get_negative_number_modbus(hass, mock_modbus_tcp_client):
 
     state = hass.states.get(SENSOR_ENTITY_ID_MODBUS_TA)
     assert state.state == "-20.0"
+
+
+def test_publish_policy():
+    """Verify changes are significant beyond the deadband or after silence."""
+    desc = XtSensorEntityDescription(key="in_hp", deadband=20.0, deadband_relative=0.02)
+    policy = PublishPolicy(min_interval=timedelta(seconds=30))
+    minute = timedelta(minutes=1)
+    # the relative deadband is larger for large values
+    assert not policy.is_significant(desc, 2000.0, 2030.0, minute)
+    assert policy.is_significant(desc, 2000.0, 2040.0, minute)
+    assert not policy.is_significant(desc, 100.0, 110.0, minute)
+    # switching off is always significant, also within the minimum interval
+    assert policy.is_significant(desc, 10.0, 0.0, timedelta(seconds=10))
+    assert policy.delay(10.0, 0.0, timedelta(seconds=10)) == timedelta(0)
+    # other changes wait for the minimum interval
+    assert policy.delay(100.0, 200.0, timedelta(seconds=10)) == timedelta(seconds=20)
+    assert policy.delay(100.0, 200.0, minute) == timedelta(0)
+    # heartbeat
+    assert policy.is_significant(desc, 100.0, 100.0, timedelta(minutes=10))
+    # without deadbands every update is published
+    assert PublishPolicy(deadband_scale=0).is_significant(desc, 100.0, 100.0, minute)
+    assert PublishPolicy().is_significant(
+        XtSensorEntityDescription(key="tw"), 40.0, 40.0, minute
+    )
+
+
+def _test_sensor_deadband_regs() -> list[MockModbusParam]:
+    # prepare register sets for 3 update cycles:
+    # 1. initial data for config entry setup
+    # 2. "ta" changes by 0.1 °C, "tvl" by 1.0 °C
+    # 3. no further changes
+    params = [provide_modbus_data()[0] for _ in range(3)]
+    for i, param in enumerate(params):
+        set_modbus_register(param, "ta", 101 if i else 100)
+        set_modbus_register(param, "tvl", 310 if i else 300)
+    return [params[0] + params[1] + params[2]]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_sensor_deadband_regs(), indirect=True
+)
+async def test_sensor_deadband(hass, mock_modbus_tcp_client, freezer):
+    """Verify changes within the deadband are published only by the heartbeat."""
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    coordinator = entry.runtime_data.coordinator
+
+    await coordinator.async_refresh()
+    assert hass.states.get(SENSOR_ENTITY_ID_MODBUS_TA).state == "10.0"
+    assert hass.states.get(SENSOR_ENTITY_ID_MODBUS_TVL).state == "31.0"
+
+    freezer.tick(timedelta(minutes=10))
+    await coordinator.async_refresh()
+    assert hass.states.get(SENSOR_ENTITY_ID_MODBUS_TA).state == "10.1"
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_sensor_deadband_regs(), indirect=True
+)
+async def test_sensor_deadband_disabled(hass, mock_modbus_tcp_client):
+    """Verify a deadband factor of 0 publishes every change."""
+    entry = await init_modbus_integration(
+        hass, mock_modbus_tcp_client, options={CONF_DEADBAND_SCALE: 0}
+    )
+
+    await entry.runtime_data.coordinator.async_refresh()
+    assert hass.states.get(SENSOR_ENTITY_ID_MODBUS_TA).state == "10.1"
+
+
+def _test_sensor_min_interval_regs() -> list[MockModbusParam]:
+    # initial data for config entry setup, then "ta" steps from 10 to 20 °C
+    # and stays there in the next scheduled update
+    params = [provide_modbus_data()[0] for _ in range(2)]
+    set_modbus_register(params[0], "ta", 100)
+    set_modbus_register(params[1], "ta", 200)
+    return [params[0] + params[1] + provide_fast_modbus_data(params[1])]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client", _test_sensor_min_interval_regs(), indirect=True
+)
+async def test_sensor_min_interval(hass, mock_modbus_tcp_client, freezer):
+    """Verify a change within the minimum interval is written after it."""
+    entry = await init_modbus_integration(
+        hass, mock_modbus_tcp_client, options={CONF_MIN_PUBLISH_INTERVAL: 60}
+    )
+    coordinator = entry.runtime_data.coordinator
+    assert hass.states.get(SENSOR_ENTITY_ID_MODBUS_TA).state == "10.0"
+
+    freezer.tick(timedelta(seconds=30))
+    await coordinator.async_refresh()
+    assert coordinator.data["ta"] == 20.0
+    assert hass.states.get(SENSOR_ENTITY_ID_MODBUS_TA).state == "10.0"
+
+    # the value stays, so the coordinator does not notify the entity again
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get(SENSOR_ENTITY_ID_MODBUS_TA).state == "20.0"
@@ -0,0 +1,76 @@
+"""Tests for the Modbus/TCP end to end using the FP simulator."""
+
+from unittest.mock import patch
+
+from homeassistant.components.number import DOMAIN as DOMAIN_NUMBER
+from homeassistant.components.number.const import ATTR_VALUE, SERVICE_SET_VALUE
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, CONF_PORT
+
+from tests.conftest import init_modbus_integration
+
+from .simulator import FpSimulator, SimulatorConfig, ThermalModel, seed_registers
+
+SENSOR_ENTITY_ID_TVL = "sensor.test_entry_xtherma_modbus_config_tvl_flow_temperature"
+NUMBER_ENTITY_ID_311 = (
+    "number.test_entry_xtherma_modbus_config_heating_curve_1_outside_temperature_low_p1"
+)
+
+
+async def test_simulator_setup_entry(hass, socket_enabled):
+    async with FpSimulator(config=SimulatorConfig(tick=0)) as simulator:
+        entry = await init_modbus_integration(
+            hass, None, config_data={CONF_PORT: simulator.port}
+        )
+        assert entry.state is ConfigEntryState.LOADED
+        state = hass.states.get(SENSOR_ENTITY_ID_TVL)
+        assert state is not None
+        assert state.state == "26.1"
+        assert simulator.slaves[1].requests > 0
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_simulator_write(hass, socket_enabled):
+    async with FpSimulator(config=SimulatorConfig(tick=0)) as simulator:
+        entry = await init_modbus_integration(
+            hass, None, config_data={CONF_PORT: simulator.port}
+        )
+        with patch(
+            "custom_components.xtherma_fp.coordinator._WRITE_VERIFY_DELAYS_S",
+            (0, 0),
+        ):
+            await hass.services.async_call(
+                DOMAIN_NUMBER,
+                SERVICE_SET_VALUE,
+                {ATTR_ENTITY_ID: NUMBER_ENTITY_ID_311, ATTR_VALUE: -5.0},
+                blocking=True,
+            )
+            await hass.async_block_till_done(wait_background_tasks=True)
+        assert simulator.slaves[1].model.get("311") == -5.0
+        assert hass.states.get(NUMBER_ENTITY_ID_311).state == "-5.0"
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_simulator_busy(hass, socket_enabled):
+    config = SimulatorConfig(tick=0, busy_rate=1.0)
+    async with FpSimulator(config=config) as simulator:
+        entry = await init_modbus_integration(
+            hass, None, config_data={CONF_PORT: simulator.port}
+        )
+        assert entry.state is ConfigEntryState.SETUP_RETRY
+        assert simulator.slaves[1].busy_responses > 0
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+def test_simulator_thermal_model():
+    model = ThermalModel(seed_registers())
+    model.set("h_target", 35.0)
+    model.step(60)
+    assert model.get("vf") > 0
+    assert model.get("tvl") > 26.1
+    assert model.get("out_hp") > model.get("in_hp") > 0
+    model.set("h_target", 10.0)
+    for _ in range(10):
+        model.step(600)
+    assert model.get("vf") == 0
+    assert model.get("tvl") < 26.1
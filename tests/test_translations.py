@@ -25,6 +25,7 @@ from custom_components.xtherma_fp.const import DOMAIN
 from custom_components.xtherma_fp.entity_descriptors import (
     ENTITY_DESCRIPTIONS,
     MODBUS_ENTITY_DESCRIPTIONS,
+    POLL_STATS_ENTITY_DESCRIPTIONS,
 )
 from tests.helpers import provide_rest_data
 
@@ -93,9 +94,14 @@ async def test_sensor_name_translation(hass, mock_rest_api_client):
             for entity_description in reg_desc.descriptors
             if isinstance(entity_description, entity_classes)
         }
+        entity_names_poll_stats = {
+            f"{prefix}.{entity_description.key}.name"
+            for entity_description in POLL_STATS_ENTITY_DESCRIPTIONS
+        }
 
         assert (
-            entity_names_rest.union(entity_names_modbus) == domain_entity_translations
+            entity_names_rest | entity_names_modbus | entity_names_poll_stats
+            == domain_entity_translations
         )
 
 
@@ -1,17 +1,32 @@
 """Tests for the Xtherma API."""
 
+import asyncio
+import hashlib
+from datetime import timedelta
+from http import HTTPStatus
+
 import pytest
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_API_KEY
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMockResponse,
 )
 
 from custom_components.xtherma_fp.const import (
     CONF_SERIAL_NUMBER,
     DOMAIN,
+    FERNPORTAL_DAILY_LIMIT,
     FERNPORTAL_URL,
 )
+from custom_components.xtherma_fp.entity_descriptors import ENTITY_DESCRIPTIONS
+from custom_components.xtherma_fp.xtherma_client_rest import (
+    _REST_DECODE_PLAN,
+    async_get_rest_quota,
+)
 from tests.const import MOCK_API_KEY, MOCK_SERIAL_NUMBER
 from tests.helpers import load_mock_data, provide_rest_data
 
@@ -80,3 +95,202 @@ async def test_restapi_setup_entry_timeout(hass, mock_rest_api_client):
     entry = await init_integration(hass, mock_rest_api_client)
     assert entry.state.value == "setup_retry"
     assert entry.reason == "Timeout error"
+
+
+_QUOTA_STORAGE_KEY = f"{DOMAIN}_rest_quota"
+_QUOTA_KEY_ID = hashlib.sha256(MOCK_API_KEY.encode()).hexdigest()[:16]
+
+
+def _store_quota(hass_storage, day: str, used: int) -> None:
+    hass_storage[_QUOTA_STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": _QUOTA_STORAGE_KEY,
+        "data": {_QUOTA_KEY_ID: {"day": day, "used": used}},
+    }
+
+
+@pytest.mark.freeze_time("2025-06-01 12:00:00+00:00")
+@pytest.mark.parametrize("mock_rest_api_client", provide_rest_data(), indirect=True)
+async def test_restapi_quota_spent(
+    hass, hass_storage, mock_rest_api_client, aioclient_mock
+):
+    """Verify the request budget used before a restart is honoured."""
+    _store_quota(hass_storage, "2025-06-01", FERNPORTAL_DAILY_LIMIT)
+    entry = await init_integration(hass, mock_rest_api_client)
+    assert entry.state.value == "setup_retry"
+    assert entry.reason == "Read data too frequently"
+    assert aioclient_mock.call_count == 0
+
+
+@pytest.mark.freeze_time("2025-06-01 12:00:00+00:00")
+@pytest.mark.parametrize("mock_rest_api_client", provide_rest_data(), indirect=True)
+async def test_restapi_quota_interval(
+    hass, hass_storage, mock_rest_api_client, freezer
+):
+    """Verify the remaining budget is spread over the rest of the day."""
+    # yesterday's requests do not count
+    _store_quota(hass_storage, "2025-05-31", FERNPORTAL_DAILY_LIMIT)
+    entry = await init_integration(hass, mock_rest_api_client)
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = entry.runtime_data.coordinator
+    # enough budget left for the shortest interval
+    assert coordinator.update_interval == timedelta(seconds=61)
+
+    quota = await async_get_rest_quota(hass, MOCK_API_KEY)
+    assert quota.used == 1
+    # 12 hours left for 72 scheduled requests
+    quota.used = FERNPORTAL_DAILY_LIMIT - 30 - 72
+    assert quota.interval() == timedelta(minutes=10)
+
+    # scheduled updates leave a reserve, refreshes requested by the user
+    # may use it
+    quota.used = FERNPORTAL_DAILY_LIMIT - 30
+    assert not quota.consume(borrow=False)
+    assert quota.consume(borrow=True)
+
+    # the budget is stored
+    freezer.tick(timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass_storage[_QUOTA_STORAGE_KEY]["data"][_QUOTA_KEY_ID] == {
+        "day": "2025-06-01",
+        "used": FERNPORTAL_DAILY_LIMIT - 29,
+    }
+
+
+async def test_restapi_not_modified(hass, aioclient_mock):
+    """Verify unchanged data is not downloaded again."""
+    mock_data = load_mock_data("rest_response.json")
+    url = f"{FERNPORTAL_URL}/{MOCK_SERIAL_NUMBER}"
+
+    async def respond(method, url, data):
+        if len(aioclient_mock.mock_calls) == 1:
+            return AiohttpClientMockResponse(
+                method, url, json=mock_data, headers={"ETag": '"v1"'}
+            )
+        return AiohttpClientMockResponse(method, url, status=HTTPStatus.NOT_MODIFIED)
+
+    aioclient_mock.get(url, side_effect=respond)
+    entry = await init_integration(hass, None)
+    coordinator = entry.runtime_data.coordinator
+    data = coordinator.data
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data == data
+    headers = [call[3] for call in aioclient_mock.mock_calls]
+    assert "If-None-Match" not in headers[0]
+    assert headers[1]["If-None-Match"] == '"v1"'
+
+
+def test_restapi_decode_plan():
+    """Verify the decode plan has a slot for every entity description."""
+    plan = _REST_DECODE_PLAN
+    assert len(plan.slots) == len(ENTITY_DESCRIPTIONS)
+    for desc in ENTITY_DESCRIPTIONS:
+        index, factor = plan.slots[desc.key]
+        assert plan.schema.keys[index] == desc.key
+        assert factor == getattr(desc, "factor", None)
+
+
+async def test_restapi_decode_keys(hass, aioclient_mock):
+    """Verify keys are matched regardless of case and unknown keys ignored."""
+    mock_data = load_mock_data("rest_response.json")
+    telemetry = mock_data["telemetry"]
+    telemetry[0]["key"] = "TVL"
+    telemetry.append({"key": "unknown", "value": "1", "input_factor": ""})
+    aioclient_mock.get(f"{FERNPORTAL_URL}/{MOCK_SERIAL_NUMBER}", json=mock_data)
+
+    entry = await init_integration(hass, None)
+
+    data = entry.runtime_data.coordinator.data
+    assert data["tvl"] == 26.1
+    assert "unknown" not in data
+    assert len(data) == len(ENTITY_DESCRIPTIONS)
+
+
+SENSOR_ENTITY_ID_TVL = "sensor.test_entry_xtherma_config_tvl_flow_temperature"
+SENSOR_ENTITY_ID_TA = "sensor.test_entry_xtherma_config_ta_outdoor_temperature"
+_SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.snapshot.test_entry_xtherma"
+
+
+@pytest.mark.freeze_time("2025-06-01 12:00:00+00:00")
+async def test_restapi_warm_start(hass, hass_storage, aioclient_mock, freezer):
+    """Verify stored data is shown right away after a restart."""
+    mock_data = load_mock_data("rest_response.json")
+    respond_event = asyncio.Event()
+    respond_event.set()
+
+    async def respond(method, url, data):
+        await respond_event.wait()
+        return AiohttpClientMockResponse(method, url, json=mock_data)
+
+    aioclient_mock.get(f"{FERNPORTAL_URL}/{MOCK_SERIAL_NUMBER}", side_effect=respond)
+    entry = await init_integration(hass, None)
+    assert aioclient_mock.call_count == 1
+
+    # the last good data is stored
+    freezer.tick(timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    stored = hass_storage[_SNAPSHOT_STORAGE_KEY]["data"]
+    assert stored["updated"] == "2025-06-01T12:00:00+00:00"
+    assert stored["values"]["tvl"] == 26.1
+
+    # restart with stored data older than the update interval, ta differs
+    # from the live value by less than its deadband
+    stored["values"]["tvl"] = 20.0
+    stored["values"]["ta"] = 13.4
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    freezer.tick(timedelta(seconds=10))
+    respond_event.clear()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SENSOR_ENTITY_ID_TVL)
+    assert state.state == "20.0"
+    assert state.attributes["restored_from"] == "2025-06-01T12:00:00+00:00"
+
+    # the first update in the background replaces the stored data
+    respond_event.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert aioclient_mock.call_count == 2
+    state = hass.states.get(SENSOR_ENTITY_ID_TVL)
+    assert state.state == "26.1"
+    assert "restored_from" not in state.attributes
+    # also unchanged and insignificantly changed values are no longer restored
+    assert hass.states.get(SENSOR_ENTITY_ID_TA).state == "13.5"
+    assert [
+        state.entity_id
+        for state in hass.states.async_all()
+        if "restored_from" in state.attributes
+    ] == []
+
+
+@pytest.mark.freeze_time("2025-06-01 12:00:00+00:00")
+@pytest.mark.parametrize("mock_rest_api_client", provide_rest_data(), indirect=True)
+async def test_restapi_warm_start_recent(
+    hass, hass_storage, mock_rest_api_client, aioclient_mock
+):
+    """Verify recent stored data saves the request at startup."""
+    hass_storage[_SNAPSHOT_STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": _SNAPSHOT_STORAGE_KEY,
+        "data": {
+            "updated": "2025-06-01T11:59:30+00:00",
+            "values": {"tvl": 20.0},
+        },
+    }
+    entry = await init_integration(hass, mock_rest_api_client)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert aioclient_mock.call_count == 0
+    assert hass.states.get(SENSOR_ENTITY_ID_TVL).state == "20.0"
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert _SNAPSHOT_STORAGE_KEY not in hass_storage
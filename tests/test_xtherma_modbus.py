@@ -1,23 +1,42 @@
 """Tests for the Xtherma Modbus API."""
 
+import asyncio
+import importlib
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock, patch
 
 import pytest
 from homeassistant.components.sensor import DOMAIN as DOMAIN_SENSOR
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.const import CONF_ADDRESS, EVENT_STATE_CHANGED
 from homeassistant.helpers.update_coordinator import UpdateFailed
-from pymodbus.pdu.pdu import ExceptionResponse
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.xtherma_fp.const import CONF_DETECT_EMPTY_MODBUS_DATA, DOMAIN
 from custom_components.xtherma_fp.entity_descriptors import (
     MODBUS_ENTITY_DESCRIPTIONS,
+    MODBUS_MAX_READ_COUNT,
+    MODBUS_POLL_INTERVAL_FAST,
     MODBUS_REGISTER_RANGES,
+    MODBUS_SENTINEL_REGISTER_SET,
+    ModbusRegisterRange,
+    ModbusRegisterSet,
+    plan_register_ranges,
 )
-from tests.conftest import MockModbusParam
+from custom_components.xtherma_fp.vendor.pymodbus import (
+    AsyncModbusTcpClient,
+    ExceptionResponse,
+)
+from custom_components.xtherma_fp.xtherma_client_modbus import (
+    _MODBUS_DECODE_PLAN,
+    _ModbusConnection,
+)
+from tests.conftest import MODBUS_CLIENT_PATH, MockModbusParam
 from tests.helpers import (
     get_modbus_register_number,
     get_platform,
+    provide_empty_fast_modbus_data,
     provide_empty_modbus_data,
     provide_modbus_data,
     set_modbus_register,
@@ -28,8 +47,14 @@ from .conftest import init_modbus_integration
 if TYPE_CHECKING:
     from custom_components.xtherma_fp import XthermaData
 
+# the vendored pymodbus is importable as pymodbus once imported
+_exceptions = importlib.import_module("pymodbus.exceptions")
+_register_message = importlib.import_module("pymodbus.pdu.register_message")
+
 SENSOR_ENTITY_ID_MODE = "sensor.test_entry_xtherma_modbus_config_current_operating_mode"
 
+SENSOR_ENTITY_ID_TVL = "sensor.test_entry_xtherma_modbus_config_tvl_flow_temperature"
+
 SWITCH_ENTITY_ID_MODBUS_450 = (
     "switch.test_entry_xtherma_modbus_config_cooling_curve_2_active"
 )
@@ -120,6 +145,45 @@ async def test_modbus_runtime_read_busy(hass, mock_modbus_tcp_client, caplog):
     )
 
 
+def _test_modbus_poll_backoff() -> list[MockModbusParam]:
+    # prepare register sets for 5 update cycles: ok, busy, busy, ok, ok
+    busy: list[MockModbusParam] = provide_modbus_data(
+        exc_code=ExceptionResponse.SLAVE_BUSY
+    )
+    param = provide_modbus_data()[0]
+    for data in (busy, busy, provide_modbus_data(), provide_modbus_data()):
+        param += data[0]
+    return [param]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client",
+    _test_modbus_poll_backoff(),
+    indirect=True,
+)
+async def test_modbus_poll_backoff(hass, mock_modbus_tcp_client):
+    """Test the poll interval backs off while busy and recovers afterwards."""
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    coordinator = entry.runtime_data.coordinator
+    min_interval = coordinator.poll_state["min_interval_s"]
+    assert coordinator.poll_state["interval_s"] == min_interval
+    assert coordinator.update_interval.total_seconds() == min_interval
+
+    intervals = []
+    for _ in range(4):
+        await coordinator.async_refresh()
+        poll_state = coordinator.poll_state
+        intervals.append(poll_state["interval_s"] / min_interval)
+        # jitter only ever delays
+        assert poll_state["interval_s"] <= poll_state["scheduled_interval_s"]
+        assert poll_state["scheduled_interval_s"] <= poll_state["interval_s"] * 1.1
+
+    # multiplicative increase, additive decrease
+    assert intervals == [2, 4, 3, 2]
+    assert coordinator.poll_state["backoff_count"] == 0
+    assert coordinator.last_update_success
+
+
 def _test_modbus_update_events() -> list[MockModbusParam]:
     # prepare register set for 2 update cyles:
     # 1. initial data in for config entry setup
@@ -139,7 +203,6 @@ def _test_modbus_update_events() -> list[MockModbusParam]:
 async def test_modbus_update_events(hass, mock_modbus_tcp_client):
     """Test that only actual value changes cause a state update.
 
-    Our entities unconditionally update their state on each coordinator update.
     Verify that only actual value changes cause a state change event to be fired.
     """
     entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
@@ -168,6 +231,51 @@ async def test_modbus_update_events(hass, mock_modbus_tcp_client):
     unsub()
 
 
+def _test_modbus_changed_key_fanout() -> list[MockModbusParam]:
+    # prepare register set for 3 update cyles:
+    # 1. initial data in for config entry setup
+    # 2. parameter #450 changes in next update
+    # 3. no changes
+    param_setup: list[MockModbusParam] = provide_modbus_data()
+    param_runtime: list[MockModbusParam] = provide_modbus_data()
+    set_modbus_register(param_runtime[0], "450", 0)
+    param_unchanged: list[MockModbusParam] = provide_modbus_data()
+    set_modbus_register(param_unchanged[0], "450", 0)
+    return [param_setup[0] + param_runtime[0] + param_unchanged[0]]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client",
+    _test_modbus_changed_key_fanout(),
+    indirect=True,
+)
+@pytest.mark.asyncio
+async def test_modbus_changed_key_fanout(hass, mock_modbus_tcp_client, freezer):
+    """Verify only listeners of changed keys are notified, unless it is time for all."""
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    assert entry.state.value == "loaded"
+    xtherma_data: XthermaData = entry.runtime_data
+    coordinator = xtherma_data.coordinator
+
+    listener_450 = Mock()
+    listener_451 = Mock()
+    listener_all = Mock()
+    coordinator.async_add_listener(listener_450, "450")
+    coordinator.async_add_listener(listener_451, "451")
+    coordinator.async_add_listener(listener_all)
+
+    await coordinator.async_refresh()
+    assert listener_450.call_count == 1
+    assert listener_451.call_count == 0
+    assert listener_all.call_count == 1
+
+    freezer.tick(timedelta(minutes=10))
+    await coordinator.async_refresh()
+    assert listener_450.call_count == 2
+    assert listener_451.call_count == 1
+    assert listener_all.call_count == 2
+
+
 def _test_provide_modbus_empty_data() -> list[MockModbusParam]:
     # prepare register set for 2 update cyles:
     # 1. initial data in for config entry setup
@@ -283,6 +391,46 @@ def test_modbus_register_range_coverage():
             )
 
 
+def test_modbus_decode_plan():
+    """Verify the decode plan locates and decodes every described register."""
+    plan = _MODBUS_DECODE_PLAN
+    assert len(plan.registers) == len(plan.schema.keys)
+    for i, desc in enumerate(plan.descriptions):
+        assert plan.schema.keys[i] == desc.key
+        assert plan.registers[i] == get_modbus_register_number(desc.key)
+        assert plan.signed_mask[i] == (desc.device_class == "temperature")
+
+
+def test_modbus_register_ranges_planned():
+    """Verify planned ranges are valid read requests in register order."""
+    last_reg = -1
+    for r in MODBUS_REGISTER_RANGES:
+        assert r.first_reg > last_reg
+        assert 0 < r.length <= MODBUS_MAX_READ_COUNT
+        last_reg = r.last_reg
+
+
+def test_modbus_register_ranges_planned_for_enabled_keys():
+    """Verify the plan covers registers of enabled keys and the sentinels."""
+    enabled_keys = {"001", "002", "ta", "in_hp"}
+    ranges = plan_register_ranges(MODBUS_ENTITY_DESCRIPTIONS, enabled_keys)
+    # settings and telemetry are too far apart to be read at once
+    assert len(ranges) == 2
+    assert ranges[0].first_reg == get_modbus_register_number("001")
+    assert ranges[0].last_reg == get_modbus_register_number("501")
+    assert ranges[0].non_empty_reg == get_modbus_register_number("501")
+    assert ranges[1].first_reg == get_modbus_register_number("controller_v")
+    assert ranges[1].last_reg == get_modbus_register_number("in_hp")
+    assert ranges[1].non_empty_reg == get_modbus_register_number("controller_v")
+
+    # disabled sentinels are still read to detect empty data
+    ranges = plan_register_ranges(MODBUS_ENTITY_DESCRIPTIONS, set())
+    assert [r.non_empty_reg for r in ranges] == [
+        get_modbus_register_number("501"),
+    ]
+    assert ranges[0].last_reg == get_modbus_register_number("controller_v")
+
+
 def test_modbus_register_descriptions_match_spec(snapshot):
     """Test modbus register range matches specification."""
     for reg_desc in MODBUS_ENTITY_DESCRIPTIONS:
@@ -314,3 +462,278 @@ def test_modbus_register_ranges_cannot_be_empty():
         <= MODBUS_REGISTER_RANGES[1].non_empty_reg
         <= MODBUS_REGISTER_RANGES[1].last_reg
     )
+
+
+@pytest.mark.parametrize("mock_modbus_tcp_client", provide_modbus_data(), indirect=True)
+@pytest.mark.asyncio
+async def test_modbus_read_ranges_pipelined(hass, mock_modbus_tcp_client):
+    """Verify all register ranges are requested on one pipelined connection."""
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    assert entry.state.value == "loaded"
+
+    mock_modbus_tcp_client.set_pipeline_depth.assert_called_once()
+    (depth,) = mock_modbus_tcp_client.set_pipeline_depth.call_args.args
+    assert depth > 1
+
+    calls = mock_modbus_tcp_client.read_holding_registers.call_args_list
+    assert sorted((c.kwargs["address"], c.kwargs["count"]) for c in calls) == [
+        (r.first_reg, r.length) for r in MODBUS_REGISTER_RANGES
+    ]
+
+
+class _RecordingTransport:
+    """Transport keeping the sent frames instead of sending them."""
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        self.frames.append(bytes(data))
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def tids(self) -> list[int]:
+        """Transaction ids of the sent frames, from their MBAP headers."""
+        return [int.from_bytes(frame[:2]) for frame in self.frames]
+
+
+async def _pipelined_requests(
+    count: int, response_timeout: float = 3
+) -> tuple[AsyncModbusTcpClient, _RecordingTransport, list[asyncio.Task]]:
+    """Send reads of registers 0..count-1 on a pipelined connection."""
+    client = AsyncModbusTcpClient(
+        "127.0.0.1", timeout=response_timeout, retries=0, reconnect_delay=0
+    )
+    client.set_pipeline_depth(count)
+    transport = _RecordingTransport()
+    client.ctx.connection_made(transport)
+    tasks = [
+        asyncio.create_task(client.read_holding_registers(address, count=1, slave=1))
+        for address in range(count)
+    ]
+    await asyncio.sleep(0)
+    assert len(transport.frames) == count
+    return client, transport, tasks
+
+
+def _respond(client: AsyncModbusTcpClient, tid: int, value: int) -> None:
+    """Receive the response to a read of one register."""
+    response = _register_message.ReadHoldingRegistersResponse(
+        dev_id=1, transaction_id=tid, registers=[value]
+    )
+    client.ctx.data_received(client.ctx.framer.buildFrame(response))
+
+
+async def test_modbus_pipelined_out_of_order():
+    """Verify responses are matched to their requests by transaction id."""
+    client, transport, tasks = await _pipelined_requests(3)
+
+    for address, tid in reversed(list(enumerate(transport.tids))):
+        _respond(client, tid, 100 + address)
+    responses = await asyncio.gather(*tasks)
+
+    assert [response.registers for response in responses] == [[100], [101], [102]]
+    assert client.ctx.pending_transactions == {}
+    client.close()
+
+
+async def test_modbus_pipelined_unknown_tid():
+    """Verify a response without a request in flight is ignored."""
+    client, transport, tasks = await _pipelined_requests(2)
+    first, second = transport.tids
+
+    _respond(client, 60000, 999)
+    _respond(client, second, 101)
+    await asyncio.sleep(0)
+    assert not tasks[0].done()
+    assert tasks[1].result().registers == [101]
+
+    _respond(client, first, 100)
+    assert (await tasks[0]).registers == [100]
+    assert client.ctx.pending_transactions == {}
+    client.close()
+
+
+async def test_modbus_pipelined_timeout():
+    """Verify a request timing out fails alone, the others complete."""
+    client, transport, tasks = await _pipelined_requests(2, response_timeout=0.05)
+
+    _respond(client, transport.tids[1], 101)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert isinstance(results[0], _exceptions.ModbusIOException)
+    assert results[1].registers == [101]
+    assert client.ctx.pending_transactions == {}
+    # a late response of the timed out request is ignored
+    _respond(client, transport.tids[0], 100)
+    client.close()
+
+
+async def test_modbus_pipelined_disconnect():
+    """Verify requests in flight fail when the connection is lost."""
+    client, _, tasks = await _pipelined_requests(2)
+
+    client.ctx.connection_lost(ConnectionResetError())
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(
+        isinstance(result, _exceptions.ConnectionException) for result in results
+    )
+    assert client.ctx.pending_transactions == {}
+    client.close()
+
+
+def _test_modbus_tiered_polling() -> list[MockModbusParam]:
+    # prepare register sets for 2 update cycles:
+    # 1. all registers for config entry setup
+    # 2. only the fast polled register sets in the next scheduled update
+    param_setup: list[MockModbusParam] = provide_modbus_data()
+    registers = [0] * (MODBUS_REGISTER_RANGES[-1].last_reg + 1)
+    for r in MODBUS_REGISTER_RANGES:
+        regs = param_setup[0][MODBUS_REGISTER_RANGES.index(r)]["registers"]
+        registers[r.first_reg : r.last_reg + 1] = regs
+    param_runtime: MockModbusParam = [
+        {
+            "registers": registers[r.first_reg : r.last_reg + 1],
+            "exc_code": None,
+            "address": r.first_reg,
+        }
+        for r in _fast_register_ranges()
+    ]
+    return [param_setup[0] + param_runtime]
+
+
+def _fast_register_sets() -> list[ModbusRegisterSet]:
+    return [
+        reg_set
+        for reg_set in MODBUS_ENTITY_DESCRIPTIONS
+        if reg_set.poll_interval == MODBUS_POLL_INTERVAL_FAST
+    ]
+
+
+def _fast_register_ranges() -> list[ModbusRegisterRange]:
+    # the fast sets contain no sentinel, one is read along
+    return plan_register_ranges([*_fast_register_sets(), MODBUS_SENTINEL_REGISTER_SET])
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client",
+    _test_modbus_tiered_polling(),
+    indirect=True,
+)
+@pytest.mark.asyncio
+async def test_modbus_tiered_polling(hass, mock_modbus_tcp_client, freezer):
+    """Verify scheduled updates only read register sets which are due."""
+    entry = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    assert entry.state.value == "loaded"
+    xtherma_data: XthermaData = entry.runtime_data
+    coordinator = xtherma_data.coordinator
+    assert coordinator.update_interval == timedelta(seconds=MODBUS_POLL_INTERVAL_FAST)
+
+    read_mock = mock_modbus_tcp_client.read_holding_registers
+    assert read_mock.call_count == len(MODBUS_REGISTER_RANGES)
+
+    freezer.tick(coordinator.update_interval)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    fast_ranges = _fast_register_ranges()
+    assert all(r.non_empty_reg is not None for r in fast_ranges)
+    calls = read_mock.call_args_list[len(MODBUS_REGISTER_RANGES) :]
+    assert sorted((c.kwargs["address"], c.kwargs["count"]) for c in calls) == [
+        (r.first_reg, r.length) for r in fast_ranges
+    ]
+    # values of register sets not read are still valid
+    state = hass.states.get(SWITCH_ENTITY_ID_MODBUS_450)
+    assert state.state == "on"
+
+
+def _test_modbus_tiered_polling_empty() -> list[MockModbusParam]:
+    # all registers for the setup, then zeros for the fast polled sets
+    param_setup: list[MockModbusParam] = provide_modbus_data()
+    param_runtime: list[MockModbusParam] = provide_empty_fast_modbus_data()
+    return [param_setup[0] + param_runtime[0]]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client",
+    _test_modbus_tiered_polling_empty(),
+    indirect=True,
+)
+@pytest.mark.asyncio
+async def test_modbus_tiered_polling_empty_data(hass, mock_modbus_tcp_client, freezer):
+    """Verify empty data is detected when only the fast sets are due."""
+    entry = await init_modbus_integration(
+        hass, mock_modbus_tcp_client, options={CONF_DETECT_EMPTY_MODBUS_DATA: True}
+    )
+    coordinator = entry.runtime_data.coordinator
+    state = hass.states.get(SENSOR_ENTITY_ID_TVL)
+
+    freezer.tick(coordinator.update_interval)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert not coordinator.last_update_success
+    # the zeros were not published as temperatures
+    assert hass.states.get(SENSOR_ENTITY_ID_TVL).state == state.state
+
+
+def _test_modbus_shared_connection() -> list[MockModbusParam]:
+    # one complete read-out for the setup of each config entry
+    param_first: list[MockModbusParam] = provide_modbus_data()
+    param_second: list[MockModbusParam] = provide_modbus_data()
+    return [param_first[0] + param_second[0]]
+
+
+@pytest.mark.parametrize(
+    "mock_modbus_tcp_client",
+    _test_modbus_shared_connection(),
+    indirect=True,
+)
+@pytest.mark.asyncio
+async def test_modbus_shared_connection(hass, mock_modbus_tcp_client):
+    """Verify config entries for one server share a single connection."""
+    first = await init_modbus_integration(hass, mock_modbus_tcp_client)
+    second = await init_modbus_integration(
+        hass,
+        mock_modbus_tcp_client,
+        config_data={CONF_ADDRESS: 2},
+        entry_id="test_entry_xtherma_second",
+    )
+    assert first.state is ConfigEntryState.LOADED
+    assert second.state is ConfigEntryState.LOADED
+    assert mock_modbus_tcp_client.connect.call_count == 1
+    calls = mock_modbus_tcp_client.read_holding_registers.call_args_list
+    assert {c.kwargs["slave"] for c in calls} == {1, 2}
+
+    # the connection is closed when its last user is unloaded
+    assert await hass.config_entries.async_unload(first.entry_id)
+    mock_modbus_tcp_client.close.assert_not_called()
+    assert await hass.config_entries.async_unload(second.entry_id)
+    mock_modbus_tcp_client.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_modbus_requests_take_turns():
+    """Verify slave addresses sharing a connection take turns for pipeline slots."""
+    with patch(MODBUS_CLIENT_PATH):
+        connection = _ModbusConnection("127.0.0.1", 502)
+    order: list[str] = []
+
+    async def request(address: int, name: str) -> None:
+        async with connection.turn(address):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(
+        request(1, "a1"),
+        request(1, "a2"),
+        request(1, "a3"),
+        request(1, "a4"),
+        request(2, "b1"),
+        request(2, "b2"),
+    )
+    assert order == ["a1", "a2", "a3", "b1", "a4", "b2"]